@@ -1,6 +1,7 @@
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
-import cantools.database.can.database as cantools_db
+if TYPE_CHECKING:
+    import cantools.database.can.database as cantools_db
 
 
 # Union type representing all possible actions ----------------------------------------#
@@ -16,6 +17,7 @@ ActionType = Union[
     "GetLastCan",
     "GetAllCan",
     "ClearCan",
+    "WaitForCan",
 ]
 
 
@@ -93,7 +95,7 @@ class SendCan:
 
     __match_args__ = ("signal", "data", "can_dbcs")
 
-    def __init__(self, signal: str | int, data: dict, can_dbcs: dict[str, cantools_db.Database]):
+    def __init__(self, signal: str | int, data: dict, can_dbcs: dict[str, "cantools_db.Database"]):
         """
         :param signal: The signal name or message ID to send
         :param data: The data to include in the CAN message. Will be encoded to bytes
@@ -101,7 +103,7 @@ class SendCan:
         """
         self.signal: str | int = signal
         self.data: dict = data
-        self.can_dbcs: dict[str, cantools_db.Database] = can_dbcs
+        self.can_dbcs: dict[str, "cantools_db.Database"] = can_dbcs
 
 
 class GetLastCan:
@@ -109,14 +111,14 @@ class GetLastCan:
 
     __match_args__ = ("signal", "can_dbcs")
 
-    def __init__(self, signal: Optional[str | int], can_dbcs: dict[str, cantools_db.Database]):
+    def __init__(self, signal: Optional[str | int], can_dbcs: dict[str, "cantools_db.Database"]):
         """
         :param signal: The signal name or message ID to get. If not specified, the last
                        message will be returned (if any) regardless of the signal/id
         :param can_dbcs: A dictionary of CAN databases, keyed by DBC file name
         """
         self.signal: Optional[str | int] = signal
-        self.can_dbcs: dict[str, cantools_db.Database] = can_dbcs
+        self.can_dbcs: dict[str, "cantools_db.Database"] = can_dbcs
 
 
 class GetAllCan:
@@ -124,14 +126,14 @@ class GetAllCan:
 
     __match_args__ = ("signal", "can_dbcs")
 
-    def __init__(self, signal: Optional[str | int], can_dbcs: dict[str, cantools_db.Database]):
+    def __init__(self, signal: Optional[str | int], can_dbcs: dict[str, "cantools_db.Database"]):
         """
         :param signal: The signal name or message ID to get. If not specified, all
                        messages will be returned (if any) regardless of the signal/id
         :param can_dbcs: A dictionary of CAN databases, keyed by DBC file name
         """
         self.signal: Optional[str | int] = signal
-        self.can_dbcs: dict[str, cantools_db.Database] = can_dbcs
+        self.can_dbcs: dict[str, "cantools_db.Database"] = can_dbcs
 
 
 class ClearCan:
@@ -139,11 +141,28 @@ class ClearCan:
 
     __match_args__ = ("signal", "can_dbcs")
 
-    def __init__(self, signal: Optional[str | int], can_dbcs: dict[str, cantools_db.Database]):
+    def __init__(self, signal: Optional[str | int], can_dbcs: dict[str, "cantools_db.Database"]):
         """
         :param signal: The signal name or message ID to clear. If not specified, all
                        messages will be cleared (if any) regardless of the signal/id
         :param can_dbcs: A dictionary of CAN databases, keyed by DBC file name
         """
         self.signal: Optional[str | int] = signal
-        self.can_dbcs: dict[str, cantools_db.Database] = can_dbcs
+        self.can_dbcs: dict[str, "cantools_db.Database"] = can_dbcs
+
+
+class WaitForCan:
+    """Action to wait for a CAN message to be received"""
+
+    __match_args__ = ("signal", "timeout", "can_dbcs")
+
+    def __init__(self, signal: Optional[str | int], timeout: float, can_dbcs: dict[str, "cantools_db.Database"]):
+        """
+        :param signal: The signal name or message ID to wait for. If not specified, any
+                       message will do
+        :param timeout: The maximum time to wait (seconds)
+        :param can_dbcs: A dictionary of CAN databases, keyed by DBC file name
+        """
+        self.signal: Optional[str | int] = signal
+        self.timeout: float = timeout
+        self.can_dbcs: dict[str, "cantools_db.Database"] = can_dbcs
@@ -1,20 +1,25 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import os
+import functools
 import logging
+import os
 
-import cantools.database as cantools_db
+if TYPE_CHECKING:
+    import cantools.database as cantools_db
 
 
 # Helper functions --------------------------------------------------------------------#
-def load_can_dbcs(dbc_fpath: str) -> dict[str, cantools_db.Database]:
+def load_can_dbcs(dbc_fpath: str) -> dict[str, "cantools_db.Database"]:
     """
     Scans a folder for DBC files and loads them as CAN databases.
 
     :param dbc_fpath: The path to the CAN DBC folder
     :return: A dictionary of CAN databases, keyed by DBC file name
     """
-    dbs: dict[str, cantools_db.Database] = {}
+    # cantools is slow to import, so only pull it in once DBCs are actually needed
+    import cantools.database as cantools_db
+
+    dbs: dict[str, "cantools_db.Database"] = {}
 
     if not dbc_fpath or not os.path.isdir(dbc_fpath):
         logging.warning(f"Invalid DBC folder path: {dbc_fpath}")
@@ -32,6 +37,82 @@ def load_can_dbcs(dbc_fpath: str) -> dict[str, cantools_db.Database]:
     return dbs
 
 
+@functools.lru_cache(maxsize=1024)
+def _encode_can_message_cached(
+    can_dbc: "cantools_db.Database", signal: str | int, data_items: tuple
+) -> tuple[int, bytes]:
+    """
+    Cached version of encode_can_message, keyed by the (hashable) sorted data items.
+
+    :param can_dbc: The CAN database to use for encoding
+    :param signal: The signal name or message ID
+    :param data_items: The sorted (signal name, value) pairs to encode
+    :return: The message ID and the encoded payload
+    """
+    return _encode_can_message(can_dbc, signal, dict(data_items))
+
+
+@functools.lru_cache(maxsize=256)
+def _get_message(can_dbc: "cantools_db.Database", signal: str | int):
+    """
+    :param can_dbc: The CAN database to look the message up in
+    :param signal: The signal name or message ID
+    :return: The cantools message definition
+    """
+    if isinstance(signal, int):
+        return can_dbc.get_message_by_frame_id(signal)
+    else:
+        return can_dbc.get_message_by_name(signal)
+
+
+def decode_can_message(
+    can_dbc: "cantools_db.Database", signal: int, data: bytes
+) -> dict:
+    """
+    Decodes a received CAN message, reusing the cached message definition.
+
+    :param can_dbc: The CAN database to use for decoding
+    :param signal: The message ID
+    :param data: The received payload
+    :return: The decoded signal values
+    """
+    return _get_message(can_dbc, signal).decode(data)
+
+
+def _encode_can_message(
+    can_dbc: "cantools_db.Database", signal: str | int, data: dict
+) -> tuple[int, bytes]:
+    """
+    :param can_dbc: The CAN database to use for encoding
+    :param signal: The signal name or message ID
+    :param data: The data to encode
+    :return: The message ID and the encoded payload
+    """
+    message = _get_message(can_dbc, signal)
+    return message.frame_id, bytes(message.encode(data))
+
+
+def encode_can_message(
+    can_dbc: "cantools_db.Database", signal: str | int, data: dict
+) -> tuple[int, bytes]:
+    """
+    Encodes a CAN message and resolves its message ID.
+    Repeated sends of the same signal with the same data reuse the cached payload. Falls
+    back to encoding every time if the data is not hashable.
+
+    :param can_dbc: The CAN database to use for encoding
+    :param signal: The signal name or message ID
+    :param data: The data to encode
+    :return: The message ID and the encoded payload
+    """
+    data_items = tuple(sorted(data.items()))
+    try:
+        hash(data_items)
+    except TypeError:
+        return _encode_can_message(can_dbc, signal, data)
+    return _encode_can_message_cached(can_dbc, signal, data_items)
+
+
 # CAN Message struct ------------------------------------------------------------------#
 class CanMessage:
     """Represents a parsed/decoded CAN message"""
@@ -51,13 +132,18 @@ class CanMessageManager:
     """Manages a collection of CAN messages"""
 
     def __init__(self):
+        # All messages in the order received, plus the same messages grouped by
+        # signal so per-signal lookups don't have to scan everything
         self._messages: list[CanMessage] = []
+        self._messages_by_signal: dict[str | int, list[CanMessage]] = {}
 
     def add_multiple(self, messages: list[CanMessage]) -> None:
         """
         :param messages: The list of CAN messages to add
         """
         self._messages.extend(messages)
+        for msg in messages:
+            self._messages_by_signal.setdefault(msg.signal, []).append(msg)
 
     def get_last(self, signal: Optional[str | int]) -> Optional[CanMessage]:
         """
@@ -65,12 +151,10 @@ class CanMessageManager:
                        will be returned (if any) regardless of the signal/id
         :return: The last CAN message with the specified signal, or None if not found
         """
-        if signal is None:
-            return self._messages[-1] if self._messages else None
-        for msg in reversed(self._messages):
-            if msg.signal == signal:
-                return msg
-        return None
+        messages = (
+            self._messages if signal is None else self._messages_by_signal.get(signal)
+        )
+        return messages[-1] if messages else None
 
     def get_all(self, signal: Optional[str | int] = None) -> list[CanMessage]:
         """
@@ -78,9 +162,9 @@ class CanMessageManager:
                        be returned (if any) regardless of the signal/id
         :return: A list of all CAN messages with the specified signal (or all)
         """
-        return list(
-            filter(lambda msg: signal is None or msg.signal == signal, self._messages)
-        )
+        if signal is None:
+            return list(self._messages)
+        return list(self._messages_by_signal.get(signal, []))
 
     def clear(self, signal: Optional[str | int] = None) -> None:
         """
@@ -89,7 +173,6 @@ class CanMessageManager:
         """
         if signal is None:
             self._messages.clear()
-        else:
-            self._messages = list(
-                filter(lambda msg: msg.signal != signal, self._messages)
-            )
+            self._messages_by_signal.clear()
+        elif self._messages_by_signal.pop(signal, None) is not None:
+            self._messages = [msg for msg in self._messages if msg.signal != signal]
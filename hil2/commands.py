@@ -1,11 +1,14 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
-import time
 import logging
+import struct
+import time
 
-import cantools.database.can.database as cantools_db
 import serial
 
+if TYPE_CHECKING:
+    import cantools.database.can.database as cantools_db
+
 from . import can_helper
 from . import hil_errors
 from . import serial_helper
@@ -32,6 +35,8 @@ SYNC_BYTES = [0xDE, 0xAD, 0xBE, 0xEF]
 
 SERIAL_RESPONSES = [READ_ID, READ_GPIO, READ_ADC, RECV_CAN, ERROR]
 
+_SEND_CAN_HEADER = struct.Struct(">BBIB")
+
 
 # Simple commands ---------------------------------------------------------------------#
 def read_id(
@@ -98,6 +103,23 @@ def write_gpio(ser: serial_helper.ThreadedSerial, pin: int, value: bool) -> None
     ser.write(bytearray(command))
 
 
+def write_gpios(
+    ser: serial_helper.ThreadedSerial, pin_values: Iterable[tuple[int, bool]]
+) -> None:
+    """
+    Writes several GPIO values to a device in a single serial write.
+    Sends back to back WRITE_GPIO commands (the device parses them one at a time).
+
+    :param ser: The serial connection to use.
+    :param pin_values: The (GPIO pin number, value) pairs to write.
+    """
+    command = []
+    for pin, value in pin_values:
+        command.extend((WRITE_GPIO, pin, int(value)))
+    logging.debug(f"Sending - WRITE_GPIO (x{len(command) // 3}): {command}")
+    ser.write(bytearray(command))
+
+
 def hiZ_gpio(ser: serial_helper.ThreadedSerial, pin: int) -> None:
     """
     Set a GPIO pin to high impedance (HiZ).
@@ -206,7 +228,7 @@ def send_can(
     ser: serial_helper.ThreadedSerial,
     bus: int,
     signal: int,
-    data: list[int],
+    data: bytes,
 ) -> None:
     """
     Sends a CAN message over the specified bus.
@@ -216,30 +238,16 @@ def send_can(
     :param signal: The CAN signal ID.
     :param data: The data to send (up to 8 bytes). When sent, will be padded with zeros.
     """
-    signal_3 = (signal >> 24) & 0xFF
-    signal_2 = (signal >> 16) & 0xFF
-    signal_1 = (signal >> 8) & 0xFF
-    signal_0 = signal & 0xFF
     length = len(data)
-    padding = [0] * (8 - len(data))
-    command = [
-        SEND_CAN,
-        bus,
-        signal_3,
-        signal_2,
-        signal_1,
-        signal_0,
-        length,
-        *data,
-        *padding,
-    ]
-    logging.debug(f"Sending - SEND_CAN: {command}")
-    print(f"Sending - SEND_CAN: {command}")
-    ser.write(bytearray(command))
+    # command, bus, big endian 32 bit signal ID, length
+    header = _SEND_CAN_HEADER.pack(SEND_CAN, bus, signal & 0xFFFFFFFF, length)
+    command = b"".join((header, data, bytes(8 - length)))
+    logging.debug(f"Sending - SEND_CAN: {list(command)}")
+    ser.write(command)
 
 
 def parse_can_messages(
-    ser: serial_helper.ThreadedSerial, bus: int, can_dbc: cantools_db.Database
+    ser: serial_helper.ThreadedSerial, bus: int, can_dbc: "cantools_db.Database"
 ) -> list[can_helper.CanMessage]:
     """
     Parses received CAN messages from the serial connection for the specified bus.
@@ -256,7 +264,7 @@ def parse_can_messages(
         ) & 0x1FFFFFFF
         data = bytes(values[6 : 6 + values[5]])
         try:
-            decoded = can_dbc.decode_message(signal, data)
+            decoded = can_helper.decode_can_message(can_dbc, signal, data)
             return can_helper.CanMessage(signal, decoded)
         except Exception as e:
             logging.error(f"Failed to decode CAN message with ID {signal} ({e})")
@@ -289,7 +297,8 @@ def parse_readings(
              - The remaining unparsed readings.
     """
 
-    logging.debug(f"Current readings to parse: {readings}")
+    # Lazy formatting: this runs on every parse pass and readings can be long
+    logging.debug("Current readings to parse: %s", readings)
     match readings:
         case []:
             return False, []
@@ -308,11 +317,17 @@ def parse_readings(
         case [cmd, bus, signal_3, signal_2, signal_1, signal_0, length, *rest] if (
             cmd == RECV_CAN and len(rest) >= length
         ):
+            data, remaining = rest[:length], rest[length:]
             logging.debug(
-                f"Parsed - RECV_CAN: {bus}, {signal_3}, {signal_2}, {signal_1}, "
-                + f"{signal_0}, {length}, {rest[:length]}"
+                "Parsed - RECV_CAN: %s, %s, %s, %s, %s, %s, %s",
+                bus,
+                signal_3,
+                signal_2,
+                signal_1,
+                signal_0,
+                length,
+                data,
             )
-            data, remaining = rest[:length], rest[length:]
             if bus not in parsed_can_messages:
                 parsed_can_messages[bus] = []
             parsed_can_messages[bus].append(
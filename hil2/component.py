@@ -144,17 +144,24 @@ class CAN:
         get_last_fn: Callable[[Optional[str | int]], Optional[can_helper.CanMessage]],
         get_all_fn: Callable[[Optional[str | int]], list[can_helper.CanMessage]],
         clear_fn: Callable[[Optional[str | int]], None],
+        wait_for_fn: Callable[
+            [Optional[str | int], float], Optional[can_helper.CanMessage]
+        ],
     ):
         """
         :param send_fn: Function to send CAN messages
         :param get_last_fn: Function to get the last received CAN message
         :param get_all_fn: Function to get all received CAN messages
         :param clear_fn: Function to clear CAN messages
+        :param wait_for_fn: Function to wait for a CAN message to be received
         """
         self._send_fn: Callable[[str | int, dict], None] = send_fn
         self._get_last_fn: Callable[[Optional[str | int]], Optional[dict]] = get_last_fn
         self._get_all_fn: Callable[[Optional[str | int]], list[dict]] = get_all_fn
         self._clear_fn: Callable[[Optional[str | int]], None] = clear_fn
+        self._wait_for_fn: Callable[
+            [Optional[str | int], float], Optional[can_helper.CanMessage]
+        ] = wait_for_fn
 
     def send(self, signal: str | int, data: dict) -> None:
         """
@@ -197,3 +204,17 @@ class CAN:
                        messages for any signal will be cleared.
         """
         self._clear_fn(signal)
+
+    def wait_for(
+        self, signal: Optional[str | int] = None, timeout: float = 0.1
+    ) -> Optional[can_helper.CanMessage]:
+        """
+        Waits for a CAN message to be received, returning as soon as one is available.
+        Already received messages count, so clear first to wait for a new one.
+
+        :param signal: The signal identifier or message id. If not specified, a message
+                       for any signal will do.
+        :param timeout: The maximum time to wait (seconds)
+        :return: The last received CAN message or None if none arrived in time
+        """
+        return self._wait_for_fn(signal, timeout)
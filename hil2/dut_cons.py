@@ -1,6 +1,5 @@
-import json
-
 from . import hil_errors
+from . import json_helper
 
 
 # HIL DUT Connection ------------------------------------------------------------------#
@@ -43,6 +42,14 @@ class DutCon:
         self.connector: str = connector
         self.pin: int = pin
 
+    def __hash__(self):
+        return hash((self.connector, self.pin))
+
+    def __eq__(self, other):
+        if not isinstance(other, DutCon):
+            return NotImplemented
+        return self.connector == other.connector and self.pin == other.pin
+
     @classmethod
     def from_json(cls, dut_con: dict) -> "DutCon":
         """
@@ -122,15 +129,13 @@ class DutCons:
         :param test_config_path: The path to the JSON configuration file
         :return: A DutCons instance
         """
-        with open(test_config_path, "r") as test_config_file:
-            test_config = json.load(test_config_file)
+        test_config = json_helper.load_json(test_config_path)
 
         board_cons = {}
         match test_config:
             case {"dut_connections": dut_connections}:
-                for board_cons in dut_connections:
-                    ...
-                    match board_cons:
+                for board_con in dut_connections:
+                    match board_con:
                         case {
                             "board": board,
                             "harness_connections": harness_connections,
@@ -141,7 +146,7 @@ class DutCons:
                         case _:
                             error_msg = (
                                 "Invalid DUT connections configuration: "
-                                f"{board_cons}"
+                                f"{board_con}"
                             )
                             raise hil_errors.ConfigurationError(error_msg)
             case _:
@@ -1,9 +1,9 @@
-from typing import Optional
+from typing import TYPE_CHECKING, ContextManager, Optional
 
 import logging
-import os
 
-import cantools.database.can.database as cantools_db
+if TYPE_CHECKING:
+    import cantools.database.can.database as cantools_db
 
 from . import action
 from . import can_helper
@@ -39,10 +39,12 @@ class Hil2:
         self._maybe_net_map: Optional[net_map.NetMap] = (
             None if net_map_path is None else net_map.NetMap.from_csv(net_map_path)
         )
-        self._can_dbcs: Optional[dict[str, cantools_db.Database]] = (
-            None
-            if can_dbc_fpath is None
-            else can_helper.load_can_dbcs(os.path.join(can_dbc_fpath))
+        # DBCs are only loaded on the first CAN action (see _get_can_dbcs)
+        self._can_dbc_fpath: Optional[str] = can_dbc_fpath
+        self._can_dbcs: Optional[dict[str, "cantools_db.Database"]] = None
+        # Resolved board/net -> HIL device connections (config is immutable)
+        self._hil_dut_cons: dict[net_map.BoardNet, dut_cons.HilDutCon] = (
+            self._build_hil_dut_cons()
         )
         # Components that need to be "shutdown" when HIL2 exits
         self._shutdown_components: dict[
@@ -70,8 +72,52 @@ class Hil2:
             comp.shutdown()
         self._shutdown_components.clear()
 
+    # Batch ---------------------------------------------------------------------------#
+    def batched_writes(self) -> ContextManager[None]:
+        """
+        Send all the outputs set inside the block together (one serial write per HIL
+        device) instead of one write each. CAN reads inside the block only update the
+        received messages of each bus once.
+        Ex: `with h.batched_writes(): pedal1.set(v1); pedal2.set(v2)`
+        """
+        return self._test_device_manager.batched_writes()
+
     # Map -----------------------------------------------------------------------------#
+    def _build_hil_dut_cons(self) -> dict[net_map.BoardNet, dut_cons.HilDutCon]:
+        """
+        Resolve every net map entry that is wired to a HIL device up front.
+        Entries that can't be resolved are skipped here and only raise if used.
+
+        :return: The resolved board/net -> HIL device connections
+        """
+        hil_dut_cons = {}
+        if self._maybe_net_map is not None:
+            for entry in self._maybe_net_map.get_entries():
+                try:
+                    hil_dut_cons[net_map.BoardNet(entry.board, entry.net)] = (
+                        self._resolve_hil_device_con(entry.board, entry.net)
+                    )
+                except hil_errors.ConnectionError:
+                    pass
+        return hil_dut_cons
+
     def _map_to_hil_device_con(self, board: str, net: str) -> dut_cons.HilDutCon:
+        """
+        Map a DUT connection (board/net or hil device/port) to a HIL device connection.
+        Resolved connections are cached, so repeated lookups are a single dict lookup.
+
+        :param board: The name of the board (DUT board or HIL device)
+        :param net: The name of the net (DUT net name or HIL device port)
+        :return: The corresponding HIL device connection
+        """
+        board_net = net_map.BoardNet(board, net)
+        hil_dut_con = self._hil_dut_cons.get(board_net)
+        if hil_dut_con is None:
+            hil_dut_con = self._resolve_hil_device_con(board, net)
+            self._hil_dut_cons[board_net] = hil_dut_con
+        return hil_dut_con
+
+    def _resolve_hil_device_con(self, board: str, net: str) -> dut_cons.HilDutCon:
         """
         Map a DUT connection (board/net or hil device/port) to a HIL device connection.
         If the board is a hil device (ex: 'RearTester'), return the corresponding HIL
@@ -259,6 +305,18 @@ class Hil2:
         return component.POT(set_fn=lambda value: self.set_pot(board, net, value))
 
     # CAN -----------------------------------------------------------------------------#
+    def _get_can_dbcs(self) -> dict[str, "cantools_db.Database"]:
+        """
+        Get the CAN DBCs, loading them the first time they are needed.
+
+        :return: A dictionary of CAN databases, keyed by DBC file name
+        """
+        if self._can_dbcs is None:
+            if self._can_dbc_fpath is None:
+                raise hil_errors.ConfigurationError("CAN DBC not configured")
+            self._can_dbcs = can_helper.load_can_dbcs(self._can_dbc_fpath)
+        return self._can_dbcs
+
     def send_can(
         self, hil_board: str, can_bus: str, signal: str | int, data: dict
     ) -> None:
@@ -270,16 +328,11 @@ class Hil2:
         :param signal: The signal identifier or message id
         :param data: The data to send. Will be encoded to raw bytes
         """
-        match self._can_dbcs:
-            case None:
-                raise hil_errors.ConfigurationError("CAN DBC not configured")
-            case can_dbcs:
-                self._test_device_manager.do_action(
-                    action.SendCan(signal, data, can_dbcs),
-                    self._test_device_manager.maybe_hil_con_from_net(
-                        hil_board, can_bus
-                    ),
-                )
+        can_dbcs = self._get_can_dbcs()
+        self._test_device_manager.do_action(
+            action.SendCan(signal, data, can_dbcs),
+            self._test_device_manager.maybe_hil_con_from_net(hil_board, can_bus),
+        )
 
     def get_last_can(
         self, hil_board: str, can_bus: str, signal: Optional[str | int] = None
@@ -293,16 +346,11 @@ class Hil2:
                        message for any signal will be returned.
         :return: The last received CAN message or None if not found
         """
-        match self._can_dbcs:
-            case None:
-                raise hil_errors.ConfigurationError("CAN DBC not configured")
-            case can_dbcs:
-                return self._test_device_manager.do_action(
-                    action.GetLastCan(signal, can_dbcs),
-                    self._test_device_manager.maybe_hil_con_from_net(
-                        hil_board, can_bus
-                    ),
-                )
+        can_dbcs = self._get_can_dbcs()
+        return self._test_device_manager.do_action(
+            action.GetLastCan(signal, can_dbcs),
+            self._test_device_manager.maybe_hil_con_from_net(hil_board, can_bus),
+        )
 
     def get_all_can(
         self, hil_board: str, can_bus: str, signal: Optional[str | int] = None
@@ -316,16 +364,11 @@ class Hil2:
                        messages for any signal will be returned.
         :return: A list of all received CAN messages
         """
-        match self._can_dbcs:
-            case None:
-                raise hil_errors.ConfigurationError("CAN DBC not configured")
-            case can_dbcs:
-                return self._test_device_manager.do_action(
-                    action.GetAllCan(signal, can_dbcs),
-                    self._test_device_manager.maybe_hil_con_from_net(
-                        hil_board, can_bus
-                    ),
-                )
+        can_dbcs = self._get_can_dbcs()
+        return self._test_device_manager.do_action(
+            action.GetAllCan(signal, can_dbcs),
+            self._test_device_manager.maybe_hil_con_from_net(hil_board, can_bus),
+        )
 
     def clear_can(
         self, hil_board: str, can_bus: str, signal: Optional[str | int] = None
@@ -338,21 +381,41 @@ class Hil2:
         :param signal: The signal identifier or message id. If not specified, all
                        messages for any signal will be cleared.
         """
-        match self._can_dbcs:
-            case None:
-                raise hil_errors.ConfigurationError("CAN DBC not configured")
-            case can_dbcs:
-                self._test_device_manager.do_action(
-                    action.ClearCan(signal, can_dbcs),
-                    self._test_device_manager.maybe_hil_con_from_net(
-                        hil_board, can_bus
-                    ),
-                )
+        can_dbcs = self._get_can_dbcs()
+        self._test_device_manager.do_action(
+            action.ClearCan(signal, can_dbcs),
+            self._test_device_manager.maybe_hil_con_from_net(hil_board, can_bus),
+        )
+
+    def wait_for_can(
+        self,
+        hil_board: str,
+        can_bus: str,
+        signal: Optional[str | int] = None,
+        timeout: float = 0.1,
+    ) -> Optional[can_helper.CanMessage]:
+        """
+        Waits for a CAN message to be received on a HIL device/can bus, returning as
+        soon as one is available. Already received messages count, so clear first to
+        wait for a new one.
+
+        :param hil_board: The name of the HIL board
+        :param can_bus: The name of the CAN bus (ex: 'VCAN')
+        :param signal: The signal identifier or message id. If not specified, a message
+                       for any signal will do.
+        :param timeout: The maximum time to wait (seconds)
+        :return: The last received CAN message or None if none arrived in time
+        """
+        can_dbcs = self._get_can_dbcs()
+        return self._test_device_manager.do_action(
+            action.WaitForCan(signal, timeout, can_dbcs),
+            self._test_device_manager.maybe_hil_con_from_net(hil_board, can_bus),
+        )
 
     def can(self, hil_board: str, can_bus: str) -> component.CAN:
         """
         Gets the CAN component for a specific HIL board and CAN bus which has shortcuts
-        to the send, get last, get all, and clear functions.
+        to the send, get last, get all, clear, and wait for functions.
 
         :param hil_board: The name of the HIL board
         :param can_bus: The name of the CAN bus (ex: 'VCAN')
@@ -363,4 +426,7 @@ class Hil2:
             lambda signal: self.get_last_can(hil_board, can_bus, signal),
             lambda signal: self.get_all_can(hil_board, can_bus, signal),
             lambda signal: self.clear_can(hil_board, can_bus, signal),
+            lambda signal, timeout: self.wait_for_can(
+                hil_board, can_bus, signal, timeout
+            ),
         )
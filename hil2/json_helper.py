@@ -0,0 +1,29 @@
+from typing import Any, Callable
+
+import json
+
+# Optional: much faster to parse than the standard library json
+_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        _loads = ujson.loads
+    except ImportError:
+        _loads = json.loads
+
+
+# Helper functions --------------------------------------------------------------------#
+def load_json(fpath: str) -> Any:
+    """
+    Loads and parses a JSON file, using orjson or ujson if one is installed.
+
+    :param fpath: The path to the JSON file
+    :return: The parsed JSON
+    """
+    with open(fpath, "rb") as json_file:
+        return _loads(json_file.read())
@@ -54,6 +54,12 @@ class NetMap:
         """
         self._entries: dict[BoardNet, NetMapEntry] = entries
 
+    def get_entries(self) -> list[NetMapEntry]:
+        """
+        :return: All of the net map entries
+        """
+        return list(self._entries.values())
+
     def get_entry(self, board: str, net: str) -> NetMapEntry:
         """
         Retrieves a net map entry by board and net name.
@@ -78,23 +84,30 @@ class NetMap:
         """
         entries = {}
         with open(file_path, newline="", encoding="utf-8") as net_map_file:
-            reader = csv.DictReader(net_map_file)
+            reader = csv.reader(net_map_file)
+            # Resolve the column indices once instead of building a dict per row
+            header = next(reader, [])
+            try:
+                board_i, net_i, component_i, designator_i = (
+                    header.index(column)
+                    for column in ("Board", "Net", "Component", "Designator")
+                )
+            except ValueError:
+                error_msg = f"Invalid net map header: {header}"
+                raise hil_errors.ConfigurationError(error_msg)
+
             for row in reader:
-                match row:
-                    case {
-                        "Board": board,
-                        "Net": net,
-                        "Component": component,
-                        "Designator": designator_str,
-                    }:
-                        entry = NetMapEntry(
-                            board=board,
-                            net=net,
-                            component=component,
-                            designator=int(designator_str),
-                        )
-                        board_net = BoardNet(entry.board, entry.net)
-                        entries[board_net] = entry
-                    case _:
-                        raise hil_errors.NetMapParseError(f"Invalid net map row: {row}")
+                if not row:
+                    continue
+                try:
+                    entry = NetMapEntry(
+                        board=row[board_i],
+                        net=row[net_i],
+                        component=row[component_i],
+                        designator=int(row[designator_i]),
+                    )
+                except (IndexError, ValueError):
+                    error_msg = f"Invalid net map row: {row}"
+                    raise hil_errors.ConfigurationError(error_msg)
+                entries[BoardNet(entry.board, entry.net)] = entry
         return cls(entries)
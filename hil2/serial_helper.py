@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import Iterator, Optional
 
+import contextlib
 import logging
 import threading
 import time
@@ -16,7 +17,6 @@ SERIAL_RETRIES = 5
 RESPONSE_WAIT = 0.2
 
 GET_TIMEOUT = 0.1
-SLEEP_INTERVAL = 0.01
 
 
 # Discover ----------------------------------------------------------------------------#
@@ -115,8 +115,12 @@ class ThreadedSerial:
         # list of bytes for each message
         self.parsed_can_messages: dict[int, list[list[int]]] = {}
 
-        # Lock for synchronizing access to shared resources
-        self.lock = threading.Lock()
+        # Lock for synchronizing access to shared resources. Also notified whenever new
+        # readings are parsed so that waiting getters wake up immediately
+        self.lock = threading.Condition()
+
+        # Pending writes while inside batched_writes(), None otherwise
+        self._write_buffer: Optional[bytearray] = None
 
         if len(self.readings) > 0:
             # If there are any initial readings, try to process them
@@ -126,66 +130,86 @@ class ThreadedSerial:
     def write(self, data: bytes) -> None:
         """
         Write data to the serial port. Safe to be called from another thread.
+        Inside batched_writes(), the data is queued instead.
 
         :param data: The data to write to the serial port
         """
-        self.serial_con.write(data)
+        if self._write_buffer is not None:
+            self._write_buffer.extend(data)
+        else:
+            self.serial_con.write(data)
 
-    def _read(self):
+    def _flush_writes(self) -> None:
         """
-        Attempt to read a single byte from the serial port.
+        Send any writes queued by batched_writes().
         """
-        read_data = self.serial_con.read(1)
-        if len(read_data) < 1:
+        if self._write_buffer:
+            self.serial_con.write(bytes(self._write_buffer))
+            self._write_buffer.clear()
+
+    @contextlib.contextmanager
+    def batched_writes(self) -> Iterator[None]:
+        """
+        Queue all writes made inside the block and send them as one serial write when
+        the block exits (or when a response is waited for, so reads still work).
+        Should only be used by the thread sending commands.
+        """
+        if self._write_buffer is not None:
+            # Already batching (nested), the outer block will send everything
+            yield
             return
-        value = int.from_bytes(read_data, "big")
-        self.readings.append(value)
+
+        self._write_buffer = bytearray()
+        try:
+            yield
+        finally:
+            self._flush_writes()
+            self._write_buffer = None
+
+    def _read(self):
+        """
+        Attempt to read from the serial port.
+        Waits (up to the serial timeout) for at least one byte, then also takes
+        everything else already buffered in the same call.
+        """
+        read_data = self.serial_con.read(max(1, self.serial_con.in_waiting))
+        self.readings.extend(read_data)
 
     def _process_readings(self):
         """
         Attempt to process read bytes.
+        Must be called with the lock held.
         """
         processed = True
+        any_processed = False
         while processed:
             # If something was processed, try to process again
             processed, self.readings = commands.parse_readings(
                 self.readings, self.parsed_readings, self.parsed_can_messages
             )
+            any_processed |= processed
 
-    def _get_readings(self, command: int) -> Optional[list[int]]:
-        """
-        Get the readings for a specific command. Safe to be called from a different thread.
-
-        :param command: The command to get readings for (used as key)
-        :return: The readings for the command, or None if not found
-        """
-        with self.lock:
-            val = self.parsed_readings.pop(command, None)
-            return val
+        if any_processed:
+            self.lock.notify_all()
 
     def get_readings_with_timeout(
-        self,
-        command: int,
-        timeout: float = GET_TIMEOUT,
-        sleep_interval: float = SLEEP_INTERVAL,
+        self, command: int, timeout: float = GET_TIMEOUT
     ) -> Optional[list[int]]:
         """
         Get the readings for a command, with a delay.
-        Retries the reading at regular intervals until the timeout is reached.
+        Waits until the readings are parsed or the timeout is reached.
         Safe to be called from a different thread.
 
         :param command: The command to get readings for (used as key)
         :param timeout: The maximum time to wait for readings (seconds)
-        :param sleep_interval: The time to wait between retries (seconds)
         :return: The readings for the command, or None if not found
         """
-
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            if (reading := self._get_readings(command)) is not None:
-                return reading
-            time.sleep(sleep_interval)
-        return None
+        # The command being waited on may still be queued
+        self._flush_writes()
+        with self.lock:
+            return self.lock.wait_for(
+                lambda: self.parsed_readings.pop(command, None), timeout
+            )
 
     def get_parsed_can_messages(self, bus: int) -> list[list[int]]:
         """
@@ -198,6 +222,21 @@ class ThreadedSerial:
         with self.lock:
             return self.parsed_can_messages.pop(bus, [])
 
+    def wait_for_can_messages(self, bus: int, timeout: float) -> bool:
+        """
+        Block until there are parsed CAN messages for a specific bus (without taking
+        them) or the timeout is reached.
+        Safe to be called from a different thread.
+
+        :param bus: The bus number to wait for messages on
+        :param timeout: The maximum time to wait (seconds)
+        :return: True if there are messages for the bus, False if the timeout was hit
+        """
+        with self.lock:
+            return self.lock.wait_for(
+                lambda: bool(self.parsed_can_messages.get(bus)), timeout
+            )
+
     def stop(self):
         """
         Stop the serial helper thread.
@@ -1,16 +1,30 @@
-from typing import Any, Optional
-
-import json
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Iterator,
+    NamedTuple,
+    Optional,
+)
+
+import array
+import concurrent.futures
+import contextlib
 import os
+import sys
 import threading
+import time
 
-import cantools.database.can.database as cantools_db
+if TYPE_CHECKING:
+    import cantools.database.can.database as cantools_db
 
 from . import action
 from . import can_helper
 from . import commands
 from . import dut_cons
 from . import hil_errors
+from . import json_helper
 from . import serial_helper
 
 
@@ -18,6 +32,17 @@ from . import serial_helper
 class AdcConfig:
     """Configuration for an ADC (Analog-to-Digital Converter)."""
 
+    __slots__ = (
+        "bit_resolution",
+        "adc_reference_v",
+        "five_v_reference_v",
+        "twenty_four_v_reference_v",
+        "_max_raw",
+        "_v_table",
+        "_five_v_table",
+        "_twenty_four_v_table",
+    )
+
     def __init__(self, adc_config: dict):
         """
         :param adc_config: The ADC configuration dictionary
@@ -46,6 +71,33 @@ class AdcConfig:
             case _:
                 raise hil_errors.ConfigurationError("Invalid ADC configuration")
 
+        # Every raw value's conversion is precomputed, so a reading is just a lookup
+        # (one table is 8 bytes per raw value, 32 KB for a 12 bit ADC)
+        self._max_raw: int = (1 << self.bit_resolution) - 1
+        v_per_raw = self.adc_reference_v / self._max_raw
+        self._v_table: array.array = array.array(
+            "d", (raw * v_per_raw for raw in range(self._max_raw + 1))
+        )
+        self._five_v_table: Optional[array.array] = self._scaled_table(
+            self.five_v_reference_v, 5.0
+        )
+        self._twenty_four_v_table: Optional[array.array] = self._scaled_table(
+            self.twenty_four_v_reference_v, 24.0
+        )
+
+    def _scaled_table(
+        self, reference_v: Optional[float], scaled_v: float
+    ) -> Optional[array.array]:
+        """
+        :param reference_v: The ADC voltage that corresponds to scaled_v (if any)
+        :param scaled_v: The voltage before the voltage divider
+        :return: The conversion table through the divider, or None if not configured
+        """
+        if reference_v is None:
+            return None
+        scale = scaled_v / reference_v
+        return array.array("d", (v * scale for v in self._v_table))
+
     def raw_to_v(self, raw_value: int) -> float:
         """
         Convert a raw ADC value to a voltage.
@@ -53,9 +105,10 @@ class AdcConfig:
         :param raw_value: The raw ADC value to convert
         :return: The converted voltage value
         """
-        if raw_value < 0 or raw_value > (2**self.bit_resolution - 1):
+        # Range check inlined (not a helper method), a call costs more than the lookup
+        if raw_value < 0 or raw_value > self._max_raw:
             raise hil_errors.RangeError(f"ADC raw value {raw_value} out of range")
-        return (raw_value / (2**self.bit_resolution - 1)) * self.adc_reference_v
+        return self._v_table[raw_value]
 
     def raw_to_5v(self, raw_value: int) -> float:
         """
@@ -65,12 +118,15 @@ class AdcConfig:
         :param raw_value: The raw ADC value to convert
         :return: The converted voltage value
         """
-        match self.five_v_reference_v:
+        match self._five_v_table:
             case None:
                 error_msg = "5V reference voltage not configured"
                 raise hil_errors.ConfigurationError(error_msg)
-            case v5r:
-                return (self.raw_to_v(raw_value) / v5r) * 5.0
+            case table:
+                if raw_value < 0 or raw_value > self._max_raw:
+                    error_msg = f"ADC raw value {raw_value} out of range"
+                    raise hil_errors.RangeError(error_msg)
+                return table[raw_value]
 
     def raw_to_24v(self, raw_value: int) -> float:
         """
@@ -80,17 +136,22 @@ class AdcConfig:
         :param raw_value: The raw ADC value to convert
         :return: The converted voltage value
         """
-        match self.twenty_four_v_reference_v:
+        match self._twenty_four_v_table:
             case None:
                 error_msg = "24V reference voltage not configured"
                 raise hil_errors.ConfigurationError(error_msg)
-            case v24r:
-                return (self.raw_to_v(raw_value) / v24r) * 24.0
+            case table:
+                if raw_value < 0 or raw_value > self._max_raw:
+                    error_msg = f"ADC raw value {raw_value} out of range"
+                    raise hil_errors.RangeError(error_msg)
+                return table[raw_value]
 
 
 class DacConfig:
     """Configuration for a DAC (Digital-to-Analog Converter)."""
 
+    __slots__ = ("bit_resolution", "reference_v", "_max_raw")
+
     def __init__(self, dac_config: dict):
         """
         :param dac_config: The DAC configuration dictionary
@@ -102,6 +163,8 @@ class DacConfig:
             case _:
                 raise hil_errors.ConfigurationError("Invalid DAC configuration")
 
+        self._max_raw: int = (1 << self.bit_resolution) - 1
+
     def v_to_raw(self, value: float) -> int:
         """
         Convert a voltage value to a raw DAC value.
@@ -109,14 +172,22 @@ class DacConfig:
         :param value: The voltage value to convert
         :return: The converted raw DAC value
         """
-        if value < 0 or value > self.reference_v:
+        if not (0 <= value <= self.reference_v):
             raise hil_errors.RangeError(f"DAC value {value} out of range")
-        return int((value / self.reference_v) * (2**self.bit_resolution - 1))
+        return int((value / self.reference_v) * self._max_raw)
 
 
 class PotConfig:
     """Configuration for a POT (Potentiometer)."""
 
+    __slots__ = (
+        "bit_resolution",
+        "reference_ohms",
+        "wiper_ohms",
+        "_steps",
+        "_max_ohms",
+    )
+
     def __init__(self, pot_config: dict):
         """
         :param pot_config: The POT configuration dictionary
@@ -129,6 +200,9 @@ class PotConfig:
             case _:
                 raise hil_errors.ConfigurationError("Invalid POT configuration")
 
+        self._steps: int = (1 << self.bit_resolution) - 1
+        self._max_ohms: float = self.reference_ohms + self.wiper_ohms
+
     def ohms_to_raw(self, value: float) -> int:
         """
         Convert an ohm value to a raw POT value.
@@ -136,25 +210,29 @@ class PotConfig:
         :param value: The ohm value to convert
         :return: The converted raw POT value
         """
-        if value < self.wiper_ohms or value > self.reference_ohms + self.wiper_ohms:
+        if not (self.wiper_ohms <= value <= self._max_ohms):
             raise hil_errors.RangeError(f"POT value {value} out of range")
-        steps = self.bit_resolution**2 - 1
-        return int((steps * (value - self.wiper_ohms)) / self.reference_ohms)
+        return int((self._steps * (value - self.wiper_ohms)) / self.reference_ohms)
 
 
 # Interface configuration -------------------------------------------------------------#
-class Port:
+class Port(NamedTuple):
     """Configuration for a port."""
 
-    def __init__(self, port: dict):
+    name: str
+    port: int
+    mode: str
+
+    @classmethod
+    def from_json(cls, port: dict) -> "Port":
         """
         :param port: The port configuration dictionary
+        :return: A Port instance
         """
         match port:
             case {"name": name, "port": port, "mode": mode}:
-                self.name: str = name
-                self.port: int = port
-                self.mode: str = mode
+                # Mode is interned as it is part of the action dispatch key
+                return cls(name, port, sys.intern(mode))
             case _:
                 raise hil_errors.ConfigurationError("Invalid Port configuration")
 
@@ -162,6 +240,15 @@ class Port:
 class Mux:
     """Configuration for a MUX (Multiplexer)."""
 
+    __slots__ = (
+        "name",
+        "mode",
+        "select_ports",
+        "port",
+        "select_count",
+        "_selects",
+    )
+
     def __init__(self, mux: dict):
         """
         :param mux: The MUX configuration dictionary
@@ -174,61 +261,73 @@ class Mux:
                 "port": port,
             }:
                 self.name: str = name
-                self.mode: str = mode
+                self.mode: str = sys.intern(mode)
                 self.select_ports: list[int] = select_ports
                 self.port: int = port
             case _:
                 raise hil_errors.ConfigurationError("Invalid Mux configuration")
 
-    def select_from_name(self, name: str) -> Optional["MuxSelect"]:
+        self.select_count: int = 1 << len(self.select_ports)
+        # Already created select lines, so they are only created once
+        self._selects: dict[int, MuxSelect] = {}
+
+    def select(self, select: int) -> "MuxSelect":
         """
-        Attempt to see if self is the base mux that is being referenced.
-        For example: DMUX_6 means DMUX is the base mux and 6 is the select line.
+        Get the (shared) MuxSelect instance for a select line of this mux.
 
-        :param name: The name of the MUX select line (ex: DMUX_6)
-        :return: The MuxSelect instance if found, None otherwise
+        :param select: The select line number (0 indexed)
+        :return: The MuxSelect instance
         """
-        name_parts = name.rsplit("_", 1)
-        if len(name_parts) < 2:
-            return None
-        if name_parts[0] != self.name:
-            return None
-        try:
-            return MuxSelect(self, int(name_parts[1]))
-        except ValueError:
-            return None
+        mux_select = self._selects.get(select)
+        if mux_select is None:
+            mux_select = MuxSelect.from_mux(self, select)
+            self._selects[select] = mux_select
+        return mux_select
 
 
-class MuxSelect:
+class MuxSelect(NamedTuple):
     """Represents a selected MUX (Multiplexer) line."""
 
-    def __init__(self, mux: Mux, select: int):
+    mux: Mux
+    select: int
+    # (select port, value) to write to select this line
+    program: tuple[tuple[int, bool], ...]
+
+    @classmethod
+    def from_mux(cls, mux: Mux, select: int) -> "MuxSelect":
         """
         :param mux: The MUX instance
         :param select: The selected line number (0 indexed)
+        :return: A MuxSelect instance
         """
-        self.mux: Mux = mux
-        self.select: int = select
+        program = tuple(
+            (p, bool(select & (1 << i))) for i, p in enumerate(mux.select_ports)
+        )
+        return cls(mux, select, program)
 
 
-class CanBus:
+class CanBus(NamedTuple):
     """Configuration for a CAN (Controller Area Network) bus."""
 
-    def __init__(self, can_bus: dict):
+    name: str
+    bus: int
+    dbc_file: str
+
+    @classmethod
+    def from_json(cls, can_bus: dict) -> "CanBus":
         """
         :param can_bus: The CAN bus configuration dictionary
+        :return: A CanBus instance
         """
         match can_bus:
             case {"name": name, "bus": bus, "dbc_file": dbc_file}:
-                self.name: str = name
-                self.bus: int = bus
-                self.dbc_file: str = dbc_file
+                return cls(name, bus, dbc_file)
             case _:
                 raise hil_errors.ConfigurationError("Invalid CAN Bus configuration")
 
     def find_dbc(
-        self, can_dbcs: dict[str, cantools_db.Database]
-    ) -> cantools_db.Database:
+        self, can_dbcs: dict[str, "cantools_db.Database"]
+    ) -> "cantools_db.Database":
         """
         Attempt to find the CAN DBC database for this CAN bus. If not found, raise an error.
 
@@ -247,6 +346,21 @@ class CanBus:
 
 # Test device -------------------------------------------------------------------------#
 class TestDevice:
+    __slots__ = (
+        "hil_id",
+        "_name",
+        "_ports",
+        "_muxs",
+        "_can_busses",
+        "_adc_config",
+        "_dac_config",
+        "_pot_config",
+        "_ser",
+        "_can_synced",
+        "device_can_busses",
+        "_io_ops",
+    )
+
     # Init ----------------------------------------------------------------------------#
     def __init__(
         self,
@@ -281,12 +395,37 @@ class TestDevice:
         # Please use set_serial() to set the serial!
         self._ser: Optional[serial_helper.ThreadedSerial] = None
 
-        self.device_can_busses: dict[int, can_helper.CanMessageManager] = dict(
-            map(
-                lambda c: (c.bus, can_helper.CanMessageManager()),
-                self._can_busses.values(),
-            )
-        )
+        # CAN buses already updated inside batched_can(), None otherwise
+        self._can_synced: Optional[set[int]] = None
+
+        self.device_can_busses: dict[int, can_helper.CanMessageManager] = {
+            c.bus: can_helper.CanMessageManager() for c in self._can_busses.values()
+        }
+
+        # Every IO port name -> (pin, mode, mux line to select first). Mux lines are
+        # enumerated up front so actions never have to parse/scan mux names.
+        # Direct ports are added last so they take priority on a name clash.
+        io_ports: dict[str, tuple[int, str, Optional[MuxSelect]]] = {}
+        for mux in self._muxs.values():
+            for select in range(mux.select_count):
+                io_ports[f"{mux.name}_{select}"] = (
+                    mux.port,
+                    mux.mode,
+                    mux.select(select),
+                )
+        for p in self._ports.values():
+            io_ports[p.name] = (p.port, p.mode, None)
+
+        # (IO port name, action type) -> operation with the pin and mux line already
+        # resolved, for every IO action the config allows. The port mode is only
+        # needed here, to pick the handler.
+        self._io_ops: dict[tuple[str, type], Callable[[action.ActionType], Any]] = {}
+        for port_name, (pin, mode, maybe_mux_select) in io_ports.items():
+            for (act_cls, act_mode), (handler, allow_mux) in self._IO_DISPATCH.items():
+                if act_mode == mode and (allow_mux or maybe_mux_select is None):
+                    self._io_ops[(port_name, act_cls)] = self._bind_io_op(
+                        handler, pin, maybe_mux_select
+                    )
 
     @classmethod
     def from_json(cls, hil_id: int, name: str, device_config_path: str):
@@ -297,37 +436,37 @@ class TestDevice:
         :param name: The name of the device
         :param device_config_path: The path to the device configuration JSON file
         """
-        with open(device_config_path, "r") as device_config_path:
-            device_config = json.load(device_config_path)
+        device_config = json_helper.load_json(device_config_path)
+        return cls.from_dict(hil_id, name, device_config)
 
-        ports = dict(
-            map(lambda p: (p.get("name"), Port(p)), device_config.get("ports", []))
-        )
-        muxs = dict(
-            map(lambda m: (m.get("name"), Mux(m)), device_config.get("muxs", []))
-        )
-        can_busses = dict(
-            map(lambda c: (c.get("name"), CanBus(c)), device_config.get("can", []))
-        )
+    @classmethod
+    def from_dict(cls, hil_id: int, name: str, device_config: dict):
+        """
+        Create a TestDevice instance from an already parsed device configuration.
 
-        match device_config:
-            case {"adc_config": adc_config_data}:
-                adc_config = AdcConfig(adc_config_data)
-            case _:
-                error_msg = f"ADC configuration missing for device {name}"
-                raise hil_errors.ConfigurationError(error_msg)
+        :param hil_id: The HIL ID of the device
+        :param name: The name of the device
+        :param device_config: The device configuration dictionary
+        """
+        ports = {
+            p.get("name"): Port.from_json(p) for p in device_config.get("ports", [])
+        }
+        muxs = {m.get("name"): Mux(m) for m in device_config.get("muxs", [])}
+        can_busses = {
+            c.get("name"): CanBus.from_json(c) for c in device_config.get("can", [])
+        }
 
-        match device_config:
-            case {"dac_config": dac_config_data}:
-                dac_config = DacConfig(dac_config_data)
-            case _:
-                dac_config = None
+        adc_config_data = device_config.get("adc_config")
+        if adc_config_data is None:
+            error_msg = f"ADC configuration missing for device {name}"
+            raise hil_errors.ConfigurationError(error_msg)
+        adc_config = AdcConfig(adc_config_data)
 
-        match device_config:
-            case {"pot_config": pot_config_data}:
-                pot_config = PotConfig(pot_config_data)
-            case _:
-                pot_config = None
+        dac_config_data = device_config.get("dac_config")
+        dac_config = None if dac_config_data is None else DacConfig(dac_config_data)
+
+        pot_config_data = device_config.get("pot_config")
+        pot_config = None if pot_config_data is None else PotConfig(pot_config_data)
 
         return cls(
             hil_id,
@@ -361,15 +500,49 @@ class TestDevice:
                 ser.stop()
 
     # Command handling ----------------------------------------------------------------#
+    def batched_writes(self) -> ContextManager[None]:
+        """
+        Send all commands issued inside the block as a single serial write.
+        (Does nothing if the serial is not set, the commands will raise instead.)
+        """
+        match self._ser:
+            case None:
+                return contextlib.nullcontext()
+            case ser:
+                return ser.batched_writes()
+
+    @contextlib.contextmanager
+    def batched_can(self) -> Iterator[None]:
+        """
+        Update the received messages of each CAN bus at most once inside the block,
+        instead of before every CAN action. Messages that arrive during the block are
+        picked up by the next CAN action after it.
+        """
+        if self._can_synced is not None:
+            # Already batching (nested)
+            yield
+            return
+
+        self._can_synced = set()
+        try:
+            yield
+        finally:
+            self._can_synced = None
+
     def _select_mux(self, mux_select: MuxSelect) -> None:
         """
         Select a MUX (Multiplexer) line.
 
         :param mux_select: The MUX selection information
         """
-        for i, p in enumerate(mux_select.mux.select_ports):
-            select_bit = True if (mux_select.select & (1 << i)) else False
-            self._set_do(p, select_bit)
+        match self._ser:
+            case None:
+                error_msg = (
+                    f"Cannot select MUX line on TestDevice {self._name}: serial not set"
+                )
+                raise hil_errors.EngineError(error_msg)
+            case ser:
+                commands.write_gpios(ser, mux_select.program)
 
     def _set_do(self, pin: int, value: bool) -> None:
         """
@@ -444,29 +617,20 @@ class TestDevice:
             case ser:
                 commands.hiZ_dac(ser, pin)
 
-    def _get_ai(self, pin: int, mode: str) -> float:
+    def _get_ai_raw(self, pin: int) -> int:
         """
-        Get an analog input (AI) reading from a pin and convert the reading to volts.
+        Get a raw analog input (AI) reading from a pin.
+        Conversion to volts depends on the port mode (see the AI handlers).
 
         :param pin: The pin number to read
-        :param mode: The mode to use for the reading (AI5, AI24, or AI)
-        :return: The voltage value read from the pin
+        :return: The raw ADC value read from the pin
         """
         match self._ser:
             case None:
                 error_msg = f"Cannot get AI on TestDevice {self._name}: serial not set"
                 raise hil_errors.EngineError(error_msg)
             case ser:
-                raw_value = commands.read_adc(ser, pin)
-
-        if mode == "AI5":
-            return self._adc_config.raw_to_5v(raw_value)
-        elif mode == "AI24":
-            return self._adc_config.raw_to_24v(raw_value)
-        elif mode == "AI":
-            return self._adc_config.raw_to_v(raw_value)
-        else:
-            raise ValueError(f"Unsupported AI mode: {mode}")
+                return commands.read_adc(ser, pin)
 
     def _set_pot(self, pin: int, value: float) -> None:
         """
@@ -483,7 +647,7 @@ class TestDevice:
                 error_msg = f"Cannot set POT on TestDevice {self._name}: serial not set"
                 raise hil_errors.EngineError(error_msg)
 
-    def _update_can_messages(self, bus: int, can_dbc: cantools_db.Database) -> None:
+    def _update_can_messages(self, bus: int, can_dbc: "cantools_db.Database") -> None:
         """
         Update the CAN message store by decoding the saved parsed can messages from the Serial.
 
@@ -503,7 +667,7 @@ class TestDevice:
                 )
 
     def _send_can(
-        self, bus: int, signal: str | int, data: dict, can_dbc: cantools_db.Database
+        self, bus: int, signal: str | int, data: dict, can_dbc: "cantools_db.Database"
     ) -> None:
         """
         Send a CAN message on the specified bus.
@@ -513,11 +677,7 @@ class TestDevice:
         :param data: The data to include in the CAN message
         :param can_dbc: The CAN database to use for encoding
         """
-        raw_data = list(can_dbc.encode_message(signal, data))
-        if isinstance(signal, int):
-            msg_id = can_dbc.get_message_by_frame_id(signal).frame_id
-        else:
-            msg_id = can_dbc.get_message_by_name(signal).frame_id
+        msg_id, payload = can_helper.encode_can_message(can_dbc, signal, data)
 
         match self._ser:
             case None:
@@ -527,109 +687,192 @@ class TestDevice:
                 )
                 raise hil_errors.EngineError(error_msg)
             case ser:
-                commands.send_can(ser, bus, msg_id, raw_data)
+                commands.send_can(ser, bus, msg_id, payload)
 
     # Action --------------------------------------------------------------------------#
-    def do_action(self, action_type: action.ActionType, port: str) -> Any:
+    def _unsupported_action(
+        self, act: action.ActionType, port: str
+    ) -> hil_errors.EngineError:
         """
-        Perform a HIL action on a specific port.
+        :param act: The action that was attempted
+        :param port: The HIL port the action was attempted on
+        :return: The error to raise for an unsupported action/port combination
+        """
+        error_msg = (
+            f"Action {type(act)} not supported for "
+            f"port {port} on device {self._name}"
+        )
+        return hil_errors.EngineError(error_msg)
 
-        :param action_type: The type of action to perform (+ includes all needed info)
-        :param port: The HIL port to perform the action on
-        :return: depends on the action type
+    def _sync_can_bus(self, can_bus: CanBus, can_dbcs: dict) -> "cantools_db.Database":
         """
+        Bring the received messages of a CAN bus up to date.
 
-        maybe_port = self._ports.get(port, None)
-        maybe_mux_select = next(
-            (
-                val
-                for m in self._muxs.values()
-                if (val := m.select_from_name(port)) is not None
-            ),
-            None,
-        )
-        maybe_can_bus = self._can_busses.get(port, None)
-
-        match (action_type, maybe_port, maybe_mux_select, maybe_can_bus):
-            # Set DO + direct port
-            case (action.SetDo(value), mp, _, _) if mp is not None and mp.mode == "DO":
-                self._set_do(mp.port, value)
-            # Set DO + mux select
-            case (action.SetDo(value), _, mms, _) if (
-                mms is not None and mms.mux.mode == "DO"
-            ):
-                self._select_mux(mms)
-                self._set_do(mms.mux.port, value)
-            # HiZ DO + direct port
-            case (action.HiZDo(), mp, _, _) if mp is not None and mp.mode == "DO":
-                self._hiZ_do(mp.port)
-            # HiZ DO + mux select
-            case (action.HiZDo(), _, mms, _) if (
-                mms is not None and mms.mux.mode == "DO"
-            ):
-                self._select_mux(mms)
-                self._hiZ_do(mms.mux.port)
-            # Get DI + direct port
-            case (action.GetDi(), mp, _, _) if mp is not None and mp.mode == "DI":
-                return self._get_di(mp.port)
-            # Get DI + mux select
-            case (action.GetDi(), _, mms, _) if (
-                mms is not None and mms.mux.mode == "DI"
-            ):
-                self._select_mux(mms)
-                return self._get_di(mms.mux.port)
-            # Set AO + direct port
-            case (action.SetAo(value), mp, _, _) if mp is not None and mp.mode == "AO":
-                self._set_ao(mp.port, value)
-            # HiZ AO + direct port
-            case (action.HiZAo(), mp, _, _) if mp is not None and mp.mode == "AO":
-                self._hiZ_ao(mp.port)
-            # Get AI + direct port
-            case (action.GetAi(), mp, _, _) if mp is not None and mp.mode.startswith(
-                "AI"
-            ):
-                return self._get_ai(mp.port, mp.mode)
-            # Get AI + mux select
-            case (
-                action.GetAi(),
-                _,
-                mms,
-                _,
-            ) if mms is not None and mms.mux.mode.startswith("AI"):
-                self._select_mux(mms)
-                return self._get_ai(mms.mux.port, mms.mux.mode)
-            # Set Pot + direct port
-            case (action.SetPot(value), mp, _, _) if (
-                mp is not None and mp.mode == "POT"
-            ):
-                self._set_pot(mp.port, value)
-            # Send CAN msg + can bus name
-            case (action.SendCan(signal, data, can_dbcs), _, _, mcb) if mcb is not None:
-                can_dbc = mcb.find_dbc(can_dbcs)
-                self._update_can_messages(mcb.bus, can_dbc)
-                self._send_can(mcb.bus, signal, data, can_dbc)
-            # Get last CAN msg + can bus name
-            case (action.GetLastCan(signal, can_dbcs), _, _, mcb) if mcb is not None:
-                can_dbc = mcb.find_dbc(can_dbcs)
-                self._update_can_messages(mcb.bus, can_dbc)
-                return self.device_can_busses[mcb.bus].get_last(signal)
-            # Get all CAN msgs + can bus name
-            case (action.GetAllCan(signal, can_dbcs), _, _, mcb) if mcb is not None:
-                can_dbc = mcb.find_dbc(can_dbcs)
-                self._update_can_messages(mcb.bus, can_dbc)
-                return self.device_can_busses[mcb.bus].get_all(signal)
-            # Clear CAN msgs + can bus name
-            case (action.ClearCan(signal, can_dbcs), _, _, mcb) if mcb is not None:
-                can_dbc = mcb.find_dbc(can_dbcs)
-                self._update_can_messages(mcb.bus, can_dbc)
-                self.device_can_busses[mcb.bus].clear(signal)
-            # Unsupported action
-            case _:
+        :param can_bus: The CAN bus to update
+        :param can_dbcs: A dictionary of CAN databases, keyed by DBC file name
+        :return: The CAN database the bus uses
+        """
+        can_dbc = can_bus.find_dbc(can_dbcs)
+        match self._can_synced:
+            case None:
+                self._update_can_messages(can_bus.bus, can_dbc)
+            case synced if can_bus.bus not in synced:
+                self._update_can_messages(can_bus.bus, can_dbc)
+                synced.add(can_bus.bus)
+        return can_dbc
+
+    def _handle_set_do(self, act: action.SetDo, pin: int) -> None:
+        """Set DO on a direct port or mux line"""
+        self._set_do(pin, act.value)
+
+    def _handle_hiZ_do(self, act: action.HiZDo, pin: int) -> None:
+        """HiZ DO on a direct port or mux line"""
+        self._hiZ_do(pin)
+
+    def _handle_get_di(self, act: action.GetDi, pin: int) -> bool:
+        """Get DI from a direct port or mux line"""
+        return self._get_di(pin)
+
+    def _handle_set_ao(self, act: action.SetAo, pin: int) -> None:
+        """Set AO on a direct port"""
+        self._set_ao(pin, act.value)
+
+    def _handle_hiZ_ao(self, act: action.HiZAo, pin: int) -> None:
+        """HiZ AO on a direct port"""
+        self._hiZ_ao(pin)
+
+    def _handle_get_ai(self, act: action.GetAi, pin: int) -> float:
+        """Get AI from a direct port or mux line"""
+        return self._adc_config.raw_to_v(self._get_ai_raw(pin))
+
+    def _handle_get_ai5(self, act: action.GetAi, pin: int) -> float:
+        """Get AI from a direct port or mux line behind the 5V divider"""
+        return self._adc_config.raw_to_5v(self._get_ai_raw(pin))
+
+    def _handle_get_ai24(self, act: action.GetAi, pin: int) -> float:
+        """Get AI from a direct port or mux line behind the 24V divider"""
+        return self._adc_config.raw_to_24v(self._get_ai_raw(pin))
+
+    def _handle_set_pot(self, act: action.SetPot, pin: int) -> None:
+        """Set POT on a direct port"""
+        self._set_pot(pin, act.value)
+
+    def _handle_send_can(self, act: action.SendCan, can_bus: CanBus) -> None:
+        """Send a CAN message on a CAN bus"""
+        can_dbc = self._sync_can_bus(can_bus, act.can_dbcs)
+        self._send_can(can_bus.bus, act.signal, act.data, can_dbc)
+
+    def _handle_get_last_can(
+        self, act: action.GetLastCan, can_bus: CanBus
+    ) -> Optional[can_helper.CanMessage]:
+        """Get the last received CAN message on a CAN bus"""
+        self._sync_can_bus(can_bus, act.can_dbcs)
+        return self.device_can_busses[can_bus.bus].get_last(act.signal)
+
+    def _handle_get_all_can(
+        self, act: action.GetAllCan, can_bus: CanBus
+    ) -> list[can_helper.CanMessage]:
+        """Get all received CAN messages on a CAN bus"""
+        self._sync_can_bus(can_bus, act.can_dbcs)
+        return self.device_can_busses[can_bus.bus].get_all(act.signal)
+
+    def _handle_clear_can(self, act: action.ClearCan, can_bus: CanBus) -> None:
+        """Clear the received CAN messages on a CAN bus"""
+        self._sync_can_bus(can_bus, act.can_dbcs)
+        self.device_can_busses[can_bus.bus].clear(act.signal)
+
+    def _handle_wait_for_can(
+        self, act: action.WaitForCan, can_bus: CanBus
+    ) -> Optional[can_helper.CanMessage]:
+        """
+        Wait for a CAN message to be received on a CAN bus. Sleeps until the serial
+        thread parses new messages for the bus instead of polling.
+        """
+        can_dbc = can_bus.find_dbc(act.can_dbcs)
+        match self._ser:
+            case None:
                 error_msg = (
-                    f"Action {type(action)} not supported for "
-                    f"port {port} on device {self._name}"
+                    f"Cannot wait for CAN messages on TestDevice {self._name}: "
+                    "serial not set"
                 )
                 raise hil_errors.EngineError(error_msg)
+            case ser:
+                messages = self.device_can_busses[can_bus.bus]
+                deadline = time.monotonic() + act.timeout
+                while True:
+                    self._update_can_messages(can_bus.bus, can_dbc)
+                    msg = messages.get_last(act.signal)
+                    remaining = deadline - time.monotonic()
+                    if msg is not None or remaining <= 0:
+                        return msg
+                    ser.wait_for_can_messages(can_bus.bus, remaining)
+
+    # (action type, port mode) -> (handler, whether the port can be a mux line)
+    _IO_DISPATCH: dict[tuple[type, str], tuple[Callable[..., Any], bool]] = {
+        (action.SetDo, "DO"): (_handle_set_do, True),
+        (action.HiZDo, "DO"): (_handle_hiZ_do, True),
+        (action.GetDi, "DI"): (_handle_get_di, True),
+        (action.SetAo, "AO"): (_handle_set_ao, False),
+        (action.HiZAo, "AO"): (_handle_hiZ_ao, False),
+        (action.GetAi, "AI"): (_handle_get_ai, True),
+        (action.GetAi, "AI5"): (_handle_get_ai5, True),
+        (action.GetAi, "AI24"): (_handle_get_ai24, True),
+        (action.SetPot, "POT"): (_handle_set_pot, False),
+    }
+
+    # Action type -> handler for actions on a CAN bus
+    _CAN_DISPATCH: dict[type, Callable[..., Any]] = {
+        action.SendCan: _handle_send_can,
+        action.GetLastCan: _handle_get_last_can,
+        action.GetAllCan: _handle_get_all_can,
+        action.ClearCan: _handle_clear_can,
+        action.WaitForCan: _handle_wait_for_can,
+    }
+
+    def _bind_io_op(
+        self,
+        handler: Callable[..., Any],
+        pin: int,
+        maybe_mux_select: Optional[MuxSelect],
+    ) -> Callable[[action.ActionType], Any]:
+        """
+        Bind an IO handler to a resolved port.
+
+        :param handler: The IO handler (from _IO_DISPATCH)
+        :param pin: The pin of the port
+        :param maybe_mux_select: The mux line to select before the action, if any
+        :return: A function that performs an action on the port
+        """
+        match maybe_mux_select:
+            case None:
+                return lambda act: handler(self, act, pin)
+            case mux_select:
+
+                def mux_op(act: action.ActionType) -> Any:
+                    with self.batched_writes():
+                        self._select_mux(mux_select)
+                        return handler(self, act, pin)
+
+                return mux_op
+
+    def do_action(self, act: action.ActionType, port: str) -> Any:
+        """
+        Perform a HIL action on a specific port.
+
+        :param act: The action to perform (+ includes all needed info)
+        :param port: The HIL port to perform the action on
+        :return: depends on the action type
+        """
+        act_cls = type(act)
+        io_op = self._io_ops.get((port, act_cls))
+        if io_op is not None:
+            return io_op(act)
+
+        maybe_can_bus = self._can_busses.get(port)
+        handler = self._CAN_DISPATCH.get(act_cls)
+        if maybe_can_bus is None or handler is None:
+            raise self._unsupported_action(act, port)
+        return handler(self, act, maybe_can_bus)
 
 
 # Test device manager -----------------------------------------------------------------#
@@ -638,6 +881,8 @@ class TestDeviceManager:
     Manages test devices for HIL (Hardware-in-the-Loop) simulation.
     """
 
+    __slots__ = ("_test_devices", "_last_device")
+
     def __init__(self, test_devices: dict[str, TestDevice]):
         """
         :param test_devices: A dictionary of test devices managed by this manager.
@@ -645,6 +890,12 @@ class TestDeviceManager:
         """
         self._test_devices: dict[str, TestDevice] = test_devices
 
+        # Tests tend to hit the same device over and over. The name and bound
+        # do_action are stored as one tuple so other threads never see a mismatch
+        self._last_device: Optional[
+            tuple[str, Callable[[action.ActionType, str], Any]]
+        ] = None
+
     @classmethod
     def from_json(
         cls, test_config_path: str, device_config_fpath: str
@@ -659,12 +910,12 @@ class TestDeviceManager:
         :return: A TestDeviceManager instance.
         """
 
-        with open(test_config_path, "r") as test_config_file:
-            test_config = json.load(test_config_file)
+        test_config = json_helper.load_json(test_config_path)
 
         hil_ids = []
         stop_events = {}
-        test_devices = {}
+        # (HIL ID, device name, device config path)
+        device_entries: list[tuple[int, str, str]] = []
         match test_config:
             case {"hil_devices": hil_devices}:
                 for device in hil_devices:
@@ -676,11 +927,10 @@ class TestDeviceManager:
                         } if (not hil_id in hil_ids):
                             hil_ids.append(hil_id)
                             stop_events[hil_id] = threading.Event()
-                            test_devices[name] = TestDevice.from_json(
-                                hil_id,
-                                name,
-                                os.path.join(device_config_fpath, config_file_name),
+                            config_path = os.path.join(
+                                device_config_fpath, config_file_name
                             )
+                            device_entries.append((hil_id, name, config_path))
                         case {"id": hil_id}:
                             error_msg = f"Duplicate HIL device ID found: {hil_id}"
                             raise hil_errors.ConfigurationError(error_msg)
@@ -691,6 +941,19 @@ class TestDeviceManager:
                 error_msg = "Invalid test configuration: missing 'hil_devices' key"
                 raise hil_errors.ConfigurationError(error_msg)
 
+        # Load each distinct device config once, all at the same time
+        # (devices can share a config file)
+        config_paths = list(dict.fromkeys(path for _, _, path in device_entries))
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            device_configs = dict(
+                zip(config_paths, executor.map(json_helper.load_json, config_paths))
+            )
+
+        test_devices = {
+            name: TestDevice.from_dict(hil_id, name, device_configs[config_path])
+            for hil_id, name, config_path in device_entries
+        }
+
         hil_devices = serial_helper.discover_devices(hil_ids)
 
         sers = {
@@ -725,22 +988,40 @@ class TestDeviceManager:
             return None
 
     def do_action(
-        self, action_type: action.ActionType, hil_dut_con: dut_cons.HilDutCon
+        self, act: action.ActionType, hil_dut_con: dut_cons.HilDutCon
     ) -> Any:
         """
         Perform an action on a HIL device.
 
-        :param action_type: The type of action to perform.
+        :param act: The action to perform.
         :param hil_dut_con: The HIL DUT connection information.
         :return: The result of the action (if any).
         """
-        if hil_dut_con.device in self._test_devices:
-            return self._test_devices[hil_dut_con.device].do_action(
-                action_type, hil_dut_con.port
-            )
+        device_name = hil_dut_con.device
+        last_device = self._last_device
+        if last_device is not None and last_device[0] == device_name:
+            device_do_action = last_device[1]
         else:
-            error_msg = f"Device {hil_dut_con.device} not found"
-            raise hil_errors.ConnectionError(error_msg)
+            if device_name not in self._test_devices:
+                error_msg = f"Device {device_name} not found"
+                raise hil_errors.ConnectionError(error_msg)
+            device_do_action = self._test_devices[device_name].do_action
+            self._last_device = (device_name, device_do_action)
+        return device_do_action(act, hil_dut_con.port)
+
+    @contextlib.contextmanager
+    def batched_writes(self) -> Iterator[None]:
+        """
+        Send all commands issued inside the block as one serial write per HIL device.
+        Commands that wait for a response still get sent before waiting.
+        Each CAN bus is also only updated once inside the block (see
+        TestDevice.batched_can()).
+        """
+        with contextlib.ExitStack() as stack:
+            for device in self._test_devices.values():
+                stack.enter_context(device.batched_writes())
+                stack.enter_context(device.batched_can())
+            yield
 
     def close(self) -> None:
         """
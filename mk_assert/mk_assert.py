@@ -1,6 +1,9 @@
 from typing import Callable, Any, Optional
 
+import contextlib
+import io
 import logging
+import sys
 
 from . import print_helper
 
@@ -10,9 +13,13 @@ g_tests: list["TestFn"] = []
 g_active_test: Optional["ActiveTestContext"] = None
 g_setup_fn: Optional[Callable[[], None]] = None
 g_teardown_fn: Optional[Callable[[], None]] = None
+g_buffer_output: bool = False
+g_print_passed: bool = True
 
 
 class TestFn:
+    __slots__ = ("func", "args", "kwargs")
+
     def __init__(
         self, func: Callable[..., None], args: tuple[Any, ...], kwargs: dict[str, Any]
     ):
@@ -33,6 +40,8 @@ class TestFn:
 
 
 class ActiveTestContext:
+    __slots__ = ("_test_fn", "passed", "failed")
+
     def __init__(self, test_fn: TestFn):
         """
         :param test_fn: The TestFn instance representing the active test.
@@ -91,6 +100,29 @@ def set_teardown_fn(teardown_fn: Callable[[], None]) -> None:
     g_teardown_fn = teardown_fn
 
 
+def set_buffer_output(buffer_output: bool) -> None:
+    """
+    Set whether each test's printed output is collected and written all at once when
+    the test finishes, instead of line by line as it runs.
+    Faster for tests with many assertions, but nothing is shown until the test ends.
+
+    :param buffer_output: True to buffer the output of each test.
+    """
+    global g_buffer_output
+    g_buffer_output = buffer_output
+
+
+def set_print_passed(print_passed: bool) -> None:
+    """
+    Set whether passing checks are printed. Failing checks and test summaries are
+    always printed.
+
+    :param print_passed: False to only print failing checks.
+    """
+    global g_print_passed
+    g_print_passed = print_passed
+
+
 def add_test(func, *args, run_now: bool = False, **kwargs):
     """
     Register a test function to be run later or immediately.
@@ -115,6 +147,24 @@ def _run_single_test(test_fn: TestFn) -> None:
     """
     Run a single test function within an active test context.
 
+    :param test_fn: The TestFn instance representing the test to run.
+    """
+    if not g_buffer_output:
+        _run_test_fn(test_fn)
+        return
+
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            _run_test_fn(test_fn)
+    finally:
+        sys.stdout.write(buffer.getvalue())
+
+
+def _run_test_fn(test_fn: TestFn) -> None:
+    """
+    Run a test function (with the setup and teardown functions) and print its summary.
+
     :param test_fn: The TestFn instance representing the test to run.
     """
     global g_setup_fn, g_teardown_fn
@@ -165,6 +215,27 @@ def clear_tests():
     g_tests.clear()
 
 
+def _record(passed: bool, msg: str) -> None:
+    """
+    Record an assertion result on the active test and print it (unless it passed and
+    passing checks are not printed).
+
+    :param passed: Whether the assertion passed.
+    :param msg: The message to display with the assertion result.
+    """
+    active_test = g_active_test
+    if active_test is None:
+        raise RuntimeError("No active test context for assertion.")
+
+    if passed:
+        active_test.success()
+        if g_print_passed:
+            print_helper.print_assert(msg, True)
+    else:
+        active_test.failure()
+        print_helper.print_assert(msg, False)
+
+
 def assert_true(cond: bool, msg: str = "", negate: bool = False):
     """
     Assert that a condition is true (or false if negate is True).
@@ -173,17 +244,8 @@ def assert_true(cond: bool, msg: str = "", negate: bool = False):
     :param msg: An optional message to display with the assertion result.
     :param negate: If True, assert that the condition is false.
     """
+    _record(cond != negate, msg)
 
-    global g_active_test
-    if g_active_test is None:
-        raise RuntimeError("No active test context for assertion.")
-
-    if cond != negate:
-        g_active_test.success()
-    else:
-        g_active_test.failure()
-
-    print_helper.print_assert(msg, cond != negate)
 
 def assert_false(cond: bool, msg: str = "", negate: bool = False):
     """
@@ -193,7 +255,7 @@ def assert_false(cond: bool, msg: str = "", negate: bool = False):
     :param msg: An optional message to display with the assertion result.
     :param negate: If True, assert that the condition is true.
     """
-    assert_true(not cond, msg, negate)
+    _record((not cond) != negate, msg)
 
 
 def assert_eqf(a: float, b: float, tol: float, msg: str = "", negate: bool = False):
@@ -206,4 +268,4 @@ def assert_eqf(a: float, b: float, tol: float, msg: str = "", negate: bool = Fal
     :param msg: An optional message to display with the assertion result.
     :param negate: If True, assert that the two numbers are not equal within the tolerance.
     """
-    assert_true(abs(a - b) <= tol, msg, negate)
+    _record((abs(a - b) <= tol) != negate, msg)
@@ -1,29 +1,38 @@
+import os
+import sys
+
 import colorama
 
-colorama.just_fix_windows_console()
+# Plain output when colors are disabled (https://no-color.org) or when stdout is not a
+# terminal (ex: redirected to a CI log)
+USE_COLOR = "NO_COLOR" not in os.environ and sys.stdout.isatty()
+
+if USE_COLOR:
+    colorama.just_fix_windows_console()
+    GREEN = colorama.Fore.GREEN
+    RED = colorama.Fore.RED
+    BLUE = colorama.Fore.BLUE
+    RESET = colorama.Style.RESET_ALL
+else:
+    GREEN = RED = BLUE = RESET = ""
 
-RESET = colorama.Style.RESET_ALL
+_SUCCESS_TAG = f"[{GREEN}SUCCESS{RESET}]"
+_FAILURE_TAG = f"[{RED}FAILURE{RESET}]"
 
 
 def print_assert(msg: str, passed: bool) -> None:
-    prefix = f"Check: {msg} " if msg else "Check: "
-    word = "SUCCESS" if passed else "FAILURE"
-    color = colorama.Fore.GREEN if passed else colorama.Fore.RED
-    print(f"{prefix}[{color}{word}{RESET}]")
+    tag = _SUCCESS_TAG if passed else _FAILURE_TAG
+    print(f"Check: {msg} {tag}" if msg else f"Check: {tag}")
 
 
 def print_test_summary(test_name: str, passed: int, failed: int) -> None:
     total = passed + failed
-    color = colorama.Fore.GREEN if failed == 0 else colorama.Fore.RED
-    print(
-        f"{colorama.Fore.BLUE}Test '{test_name}' finished:{RESET} ",
-        end="",
-    )
+    header = f"{BLUE}Test '{test_name}' finished:{RESET} "
     if failed == 0:
-        print(f"{color}all passed{RESET} - {color}{passed}{RESET}/{total}")
+        print(f"{header}{GREEN}all passed{RESET} - {GREEN}{passed}{RESET}/{total}")
     else:
-        print(f"{color}{failed} failed{RESET} - {color}{passed}{RESET}/{total}")
+        print(f"{header}{RED}{failed} failed{RESET} - {RED}{passed}{RESET}/{total}")
 
 
 def print_test_start(test_name: str) -> None:
-    print(f"{colorama.Fore.BLUE}Starting test '{test_name}'...{RESET}")
+    print(f"{BLUE}Starting test '{test_name}'...{RESET}")
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import NamedTuple, Optional
 
 import hil2.hil2 as hil2
 import hil2.component as hil2_comp
@@ -17,6 +17,46 @@ SLEEP_TIME = 0.03 # seconds
 
 MSG_NAME = "raw_throttle_brake"
 
+# Voltages for every whole percent (tests almost always use whole percents)
+PEDAL_VOLTS_1 = tuple(PEDAL_LOW_V + p * PEDAL_PERCENT_V for p in range(101))
+PEDAL_VOLTS_2 = tuple(PEDAL_HIGH_V - p * PEDAL_PERCENT_V for p in range(101))
+
+# Pedal values ------------------------------------------------------------------------#
+class PedalValues(NamedTuple):
+    """The pedal signals of a MSG_NAME message, unpacked once per message"""
+    brake: float
+    brake_right: float
+    throttle: float
+    throttle_right: float
+
+    @classmethod
+    def from_msg(cls, msg: Optional[can_helper.CanMessage]) -> Optional["PedalValues"]:
+        if msg is None:
+            return None
+        data = msg.data
+        return cls(data["brake"], data["brake_right"], data["throttle"], data["throttle_right"])
+
+# Dashboard components ----------------------------------------------------------------#
+class Dashboard(NamedTuple):
+    """The HIL components used by the dashboard tests, looked up once"""
+    brk1: hil2_comp.AO
+    brk2: hil2_comp.AO
+    thrtl1: hil2_comp.AO
+    thrtl2: hil2_comp.AO
+    sdc: hil2_comp.DI
+    mcan: hil2_comp.CAN
+
+    @classmethod
+    def from_hil(cls, h: hil2.Hil2) -> "Dashboard":
+        return cls(
+            h.ao("Dashboard", "BRK1_RAW"),
+            h.ao("Dashboard", "BRK2_RAW"),
+            h.ao("Dashboard", "THRTL1_RAW"),
+            h.ao("Dashboard", "THRTL2_RAW"),
+            h.di("Dashboard", "SDC"),
+            h.can("HIL2", "VCAN"),
+        )
+
 # Helpers -----------------------------------------------------------------------------#
 def pedal_percent_to_volts_1(percent: float) -> float:
     """
@@ -25,6 +65,8 @@ def pedal_percent_to_volts_1(percent: float) -> float:
     :param percent: Percent value from 0 to 100
     :return: Corresponding voltage value
     """
+    if isinstance(percent, int) and 0 <= percent <= 100:
+        return PEDAL_VOLTS_1[percent]
     return PEDAL_LOW_V + percent * PEDAL_PERCENT_V
 
 def pedal_percent_to_volts_2(percent: float) -> float:
@@ -34,6 +76,8 @@ def pedal_percent_to_volts_2(percent: float) -> float:
     :param percent: Percent value from 0 to 100
     :return: Corresponding voltage value
     """
+    if isinstance(percent, int) and 0 <= percent <= 100:
+        return PEDAL_VOLTS_2[percent]
     return PEDAL_HIGH_V - percent * PEDAL_PERCENT_V
 
 def power_cycle(pow: hil2_comp.DO, delay_s: float = 0.5):
@@ -47,34 +91,57 @@ def set_both(pedal1: hil2_comp.AO, pedal2: hil2_comp.AO, percent: float) -> None
     """
     Set a set of two pedals to the same percent value.
 
-    :param pedal1: First pedal AO component
-    :param pedal2: Second pedal AO component
+    :param pedal1: First pedal AO component (in normal orientation)
+    :param pedal2: Second pedal AO component (in inverted orientation)
     :param percent: Percent value from 0 to 100
     """
-    pedal1.set(percent)
-    pedal2.set(percent)
-
-def check_msg(msg: Optional[can_helper.CanMessage], test_prefix: str):
-    mka.assert_true(msg is not None, f"{test_prefix}: VCAN message received")
-
-def check_brakes(msg: Optional[can_helper.CanMessage], exp_percent: float, tol_v: float, test_prefix: str):
-    check_msg(msg, test_prefix)
-    mka.assert_eqf(msg is not None and msg.data["brake"],          pedal_percent_to_volts(exp_percent), tol_v, f"{test_prefix}: brake left {exp_percent}%")
-    mka.assert_eqf(msg is not None and msg.data["brake_right"],    pedal_percent_to_volts(exp_percent), tol_v, f"{test_prefix}: brake right {exp_percent}%")
+    pedal1.set(pedal_percent_to_volts_1(percent))
+    pedal2.set(pedal_percent_to_volts_2(percent))
 
-def check_throttle_left(msg: Optional[can_helper.CanMessage], exp_percent: float, tol_v: float, test_prefix: str):
-    mka.assert_eqf(msg is not None and msg.data["throttle"],       pedal_percent_to_volts(exp_percent), tol_v, f"{test_prefix}: throttle left {exp_percent}%")
-
-def check_throttle_right(msg: Optional[can_helper.CanMessage], exp_percent: float, tol_v: float, test_prefix: str):
-    mka.assert_eqf(msg is not None and msg.data["throttle_right"], pedal_percent_to_volts(exp_percent), tol_v, f"{test_prefix}: throttle right {exp_percent}%")
-
-def check_throttles(msg: Optional[can_helper.CanMessage], exp_percent: float, tol_v: float, test_prefix: str):
-    check_msg(msg, test_prefix)
-    check_throttle_left(msg, exp_percent, tol_v, test_prefix)
-    check_throttle_right(msg, exp_percent, tol_v, test_prefix)
+def wait_for_msg(mcan: hil2_comp.CAN, msg_name: str, timeout: float = SLEEP_TIME) -> Optional[can_helper.CanMessage]:
+    """
+    Wait for a message to be received (since the last clear), instead of always
+    sleeping for the full timeout. Blocks until the serial thread gets a message
+    rather than polling.
+
+    :param mcan: CAN bus component
+    :param msg_name: Name of the message to wait for
+    :param timeout: Maximum time to wait in seconds
+    :return: The last received message, or None if none arrived in time
+    """
+    return mcan.wait_for(msg_name, timeout)
+
+def check_msg(pedals: Optional[PedalValues], test_prefix: str) -> bool:
+    received = pedals is not None
+    mka.assert_true(received, f"{test_prefix}: VCAN message received")
+    return received
+
+def check_brakes(pedals: Optional[PedalValues], exp_percent: float, tol_v: float, test_prefix: str):
+    if not check_msg(pedals, test_prefix):
+        return
+    mka.assert_eqf(pedals.brake,       pedal_percent_to_volts_1(exp_percent), tol_v, f"{test_prefix}: brake left {exp_percent}%")
+    mka.assert_eqf(pedals.brake_right, pedal_percent_to_volts_2(exp_percent), tol_v, f"{test_prefix}: brake right {exp_percent}%")
+
+def check_throttle_left(pedals: Optional[PedalValues], exp_percent: float, tol_v: float, test_prefix: str):
+    # A missing message is reported by check_msg
+    if pedals is None:
+        return
+    mka.assert_eqf(pedals.throttle,       pedal_percent_to_volts_1(exp_percent), tol_v, f"{test_prefix}: throttle left {exp_percent}%")
+
+def check_throttle_right(pedals: Optional[PedalValues], exp_percent: float, tol_v: float, test_prefix: str):
+    # A missing message is reported by check_msg
+    if pedals is None:
+        return
+    mka.assert_eqf(pedals.throttle_right, pedal_percent_to_volts_2(exp_percent), tol_v, f"{test_prefix}: throttle right {exp_percent}%")
+
+def check_throttles(pedals: Optional[PedalValues], exp_percent: float, tol_v: float, test_prefix: str):
+    if not check_msg(pedals, test_prefix):
+        return
+    mka.assert_eqf(pedals.throttle,       pedal_percent_to_volts_1(exp_percent), tol_v, f"{test_prefix}: throttle left {exp_percent}%")
+    mka.assert_eqf(pedals.throttle_right, pedal_percent_to_volts_2(exp_percent), tol_v, f"{test_prefix}: throttle right {exp_percent}%")
 
 # EV.4.7.2 ----------------------------------------------------------------------------#
-def ev_4_7_2_test(h: hil2.Hil2):
+def ev_4_7_2_test(h: hil2.Hil2, dash: Dashboard):
     """
     If brake is activated (5% pressed) and throttle is activated more than 25%, motor
     must shutdown and stay shutdown until throttle is under 5%
@@ -87,68 +154,85 @@ def ev_4_7_2_test(h: hil2.Hil2):
     Note: Check for motor off: throttle can message is 0
     """
 
-    brk1 = h.ao("Dashboard", "BRK1_RAW")
-    brk2 = h.ao("Dashboard", "BRK2_RAW")
-    thrtl1 = h.ao("Dashboard", "THRTL1_RAW")
-    thrtl2 = h.ao("Dashboard", "THRTL2_RAW")
-    mcan = h.can("HIL2", "VCAN")
+    brk1 = dash.brk1
+    brk2 = dash.brk2
+    thrtl1 = dash.thrtl1
+    thrtl2 = dash.thrtl2
+    mcan = dash.mcan
 
     # Setup: set brake and throttle to 0%
-    set_both(brk1, brk2, pedal_percent_to_volts(0))
-    set_both(thrtl1, thrtl2, pedal_percent_to_volts(0))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_brakes(msg, 0, 0.1, "Setup")
-    check_throttles(msg, 0, 0.1, "Setup")
+    mcan.clear(MSG_NAME)
+    with h.batched_writes():
+        set_both(brk1, brk2, 0)
+        set_both(thrtl1, thrtl2, 0)
+    pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+    check_brakes(pedals, 0, 0.1, "Setup")
+    check_throttles(pedals, 0, 0.1, "Setup")
     
     # Test 1: brake low, throttle low, check motor on
-    set_both(brk1, brk2, pedal_percent_to_volts(5))
-    set_both(thrtl1, thrtl2, pedal_percent_to_volts(5))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_brakes(msg, 5, 0.1, "Brakes low, throttle low")
-    check_throttles(msg, 5, 0.1, "Brakes low, throttle low")
+    mcan.clear(MSG_NAME)
+    with h.batched_writes():
+        set_both(brk1, brk2, 5)
+        set_both(thrtl1, thrtl2, 5)
+    pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+    check_brakes(pedals, 5, 0.1, "Brakes low, throttle low")
+    check_throttles(pedals, 5, 0.1, "Brakes low, throttle low")
 
     # Test 2: brake high, throttle low, check motor on
-    set_both(brk1, brk2, pedal_percent_to_volts(50))
-    set_both(thrtl1, thrtl2, pedal_percent_to_volts(5))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_brakes(msg, 50, 0.1, "Brakes high, throttle low")
-    check_throttles(msg, 5, 0.1, "Brakes high, throttle low")
+    mcan.clear(MSG_NAME)
+    with h.batched_writes():
+        set_both(brk1, brk2, 50)
+        set_both(thrtl1, thrtl2, 5)
+    pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+    check_brakes(pedals, 50, 0.1, "Brakes high, throttle low")
+    check_throttles(pedals, 5, 0.1, "Brakes high, throttle low")
 
     # Test 3: brake high, throttle high, check motor off
-    set_both(brk1, brk2, pedal_percent_to_volts(50))
-    set_both(thrtl1, thrtl2, pedal_percent_to_volts(50))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_brakes(msg, 50, 0.1, "Brakes high, throttle high")
-    check_throttles(msg, 0, 0.1, "Brakes high, throttle high")
+    mcan.clear(MSG_NAME)
+    with h.batched_writes():
+        set_both(brk1, brk2, 50)
+        set_both(thrtl1, thrtl2, 50)
+    pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+    check_brakes(pedals, 50, 0.1, "Brakes high, throttle high")
+    check_throttles(pedals, 0, 0.1, "Brakes high, throttle high")
 
     # Test 4: brake low, throttle mid, check motor off (sweep down to 5% on throttle)
-    set_both(brk1, brk2, pedal_percent_to_volts(5))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_brakes(msg, 5, 0.1, "Brakes low, throttle mid")
-
-    for p in range(50, 4, -1):
-        set_both(thrtl1, thrtl2, pedal_percent_to_volts(p))
-        time.sleep(SLEEP_TIME)
-        msg = mcan.get_last(MSG_NAME)
-        expected_throttle = 0 if p > 5 else pedal_percent_to_volts(p)
-        check_throttles(msg, expected_throttle, 0.1, f"Brakes low, throttle {p} (expected {expected_throttle}%)")
+    mcan.clear(MSG_NAME)
+    with h.batched_writes():
+        set_both(brk1, brk2, 5)
+    pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+    check_brakes(pedals, 5, 0.1, "Brakes low, throttle mid")
+
+    # (percent, volts to set on each sensor, expected throttle) for every step,
+    # computed before sweeping
+    sweep = [
+        (p, pedal_percent_to_volts_1(p), pedal_percent_to_volts_2(p), 0 if p > 5 else p)
+        for p in range(50, 4, -1)
+    ]
+    clear_msgs = mcan.clear
+    batched_writes = h.batched_writes
+    set_thrtl1 = thrtl1.set
+    set_thrtl2 = thrtl2.set
+    for p, v1, v2, expected_throttle in sweep:
+        clear_msgs(MSG_NAME)
+        with batched_writes():
+            set_thrtl1(v1)
+            set_thrtl2(v2)
+        pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+        check_throttles(pedals, expected_throttle, 0.1, f"Brakes low, throttle {p} (expected {expected_throttle}%)")
     
     # Test 5: brake low, throttle mid, check motor back on
-    set_both(brk1, brk2, pedal_percent_to_volts(5))
-    set_both(thrtl1, thrtl2, pedal_percent_to_volts(25))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_brakes(msg, 5, 0.1, "Brakes low, throttle mid")
-    check_throttles(msg, 25, 0.1, "Brakes low, throttle mid")
+    mcan.clear(MSG_NAME)
+    with h.batched_writes():
+        set_both(brk1, brk2, 5)
+        set_both(thrtl1, thrtl2, 25)
+    pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+    check_brakes(pedals, 5, 0.1, "Brakes low, throttle mid")
+    check_throttles(pedals, 25, 0.1, "Brakes low, throttle mid")
 
 
 # T.4.2.5 -----------------------------------------------------------------------------#
-def t_4_2_5_impl(left_is_1: bool, sens1: hil2_comp.AO, sens2: hil2_comp.AO, sdc: hil2_comp.DI, mcan: hil2_comp.CAN):
+def t_4_2_5_impl(h: hil2.Hil2, left_is_1: bool, sens1: hil2_comp.AO, sens2: hil2_comp.AO, sdc: hil2_comp.DI, mcan: hil2_comp.CAN):
     """
     - sens1 and sens2 similar, check motor on, sdc not triggered
     - sens1 and sens2 slightly different, check motor on, sdc not triggered
@@ -160,111 +244,81 @@ def t_4_2_5_impl(left_is_1: bool, sens1: hil2_comp.AO, sens2: hil2_comp.AO, sdc:
     Note: Check for motor off: throttle can message is 0
     """
 
-    # Sensors similar, check motor on, sdc not triggered
-    set_both(sens1, sens2, pedal_percent_to_volts(20))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_throttles(msg, 20, 0.1, "Sensors similar")
-    mka.assert_false(sdc.get(), "SDC not triggered")
-    
-    # Sensors slightly different, check motor on, sdc not triggered
-    sens1.set(pedal_percent_to_volts(20))
-    sens2.set(pedal_percent_to_volts(25))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_msg(msg, "Sensors slightly different")
+    # sens1 is the normal (left) pedal sensor only if left_is_1
     if left_is_1:
-        check_throttle_left(msg, 20, 0.1, "Sensors slightly different")
-        check_throttle_right(msg, 25, 0.1, "Sensors slightly different")
+        sens1_to_volts, sens2_to_volts = pedal_percent_to_volts_1, pedal_percent_to_volts_2
     else:
-        check_throttle_left(msg, 25, 0.1, "Sensors slightly different")
-        check_throttle_right(msg, 20, 0.1, "Sensors slightly different")
-    mka.assert_false(sdc.get(), "SDC not triggered")
-
-    # Sensors 10% different, check motor on, sdc not triggered
-    sens1.set(pedal_percent_to_volts(20))
-    sens2.set(pedal_percent_to_volts(30))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_msg(msg, "Sensors 10% different")
-    if left_is_1:
-        check_throttle_left(msg, 20, 0.1, "Sensors 10% different")
-        check_throttle_right(msg, 30, 0.1, "Sensors 10% different")
-    else:
-        check_throttle_left(msg, 30, 0.1, "Sensors 10% different")
-        check_throttle_right(msg, 20, 0.1, "Sensors 10% different")
-    mka.assert_false(sdc.get(), "SDC not triggered")
-
-    # Sensors slightly different, check motor on, sdc not triggered
-    sens1.set(pedal_percent_to_volts(25))
-    sens2.set(pedal_percent_to_volts(30))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_msg(msg, "Sensors slightly different")
-    if left_is_1:
-        check_throttle_left(msg, 25, 0.1, "Sensors slightly different")
-        check_throttle_right(msg, 30, 0.1, "Sensors slightly different")
-    else:
-        check_throttle_left(msg, 30, 0.1, "Sensors slightly different")
-        check_throttle_right(msg, 25, 0.1, "Sensors slightly different")
-    mka.assert_false(sdc.get(), "SDC not triggered")
-
-    # Sensors 10% different, check motor on, sdc not triggered
-    sens1.set(pedal_percent_to_volts(20))
-    sens2.set(pedal_percent_to_volts(30))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_msg(msg, "Sensors 10% different")
-    if left_is_1:
-        check_throttle_left(msg, 20, 0.1, "Sensors 10% different")
-        check_throttle_right(msg, 30, 0.1, "Sensors 10% different")
-    else:
-        check_throttle_left(msg, 30, 0.1, "Sensors 10% different")
-        check_throttle_right(msg, 20, 0.1, "Sensors 10% different")
-    mka.assert_false(sdc.get(), "SDC not triggered")
+        sens1_to_volts, sens2_to_volts = pedal_percent_to_volts_2, pedal_percent_to_volts_1
+
+    # (sens1 percent, sens2 percent, label) for each step
+    steps = (
+        (20, 20, "Sensors similar"),
+        (20, 25, "Sensors slightly different"),
+        (20, 30, "Sensors 10% different"),
+        (25, 30, "Sensors slightly different"),
+        (20, 30, "Sensors 10% different"),
+    )
+    for p1, p2, label in steps:
+        # Check motor on, sdc not triggered
+        mcan.clear(MSG_NAME)
+        with h.batched_writes():
+            sens1.set(sens1_to_volts(p1))
+            sens2.set(sens2_to_volts(p2))
+        pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+        if p1 == p2:
+            check_throttles(pedals, p1, 0.1, label)
+        else:
+            left, right = (p1, p2) if left_is_1 else (p2, p1)
+            check_msg(pedals, label)
+            check_throttle_left(pedals, left, 0.1, label)
+            check_throttle_right(pedals, right, 0.1, label)
+        mka.assert_false(sdc.get(), "SDC not triggered")
 
     # Sensors still 10% different (~100 msec later), check motor off, sdc not triggered
     time.sleep(0.1)
-    msg = mcan.get_last(MSG_NAME)
-    check_msg(msg, "Sensors still 10% different (~100 msec later)")
-    check_throttles(msg, 0, 0.1, "Sensors still 10% different (~100 msec later)")
+    pedals = PedalValues.from_msg(mcan.get_last(MSG_NAME))
+    check_throttles(pedals, 0, 0.1, "Sensors still 10% different (~100 msec later)")
     mka.assert_false(sdc.get(), "SDC not triggered")
 
     # Sensors similar, check motor on, sdc not triggered
-    set_both(sens1, sens2, pedal_percent_to_volts(20))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_throttles(msg, 20, 0.1, "Sensors similar")
+    mcan.clear(MSG_NAME)
+    with h.batched_writes():
+        sens1.set(sens1_to_volts(20))
+        sens2.set(sens2_to_volts(20))
+    pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+    check_throttles(pedals, 20, 0.1, "Sensors similar")
     mka.assert_false(sdc.get(), "SDC not triggered")
 
 
-def t_4_2_5_test(h: hil2.Hil2):
+def t_4_2_5_test(h: hil2.Hil2, dash: Dashboard):
     """
     If the throttle sensors differ by more than 10% of the pedal travel or disconnects
     and this exists for more than 100 msec, motors must be stopped, sdc isn't tripped
     """
-    thrtl1 = h.ao("Dashboard", "THRTL1_RAW")
-    thrtl2 = h.ao("Dashboard", "THRTL2_RAW")
-    sdc = h.di("Dashboard", "SDC")
-    mcan = h.can("HIL2", "VCAN")
+    thrtl1 = dash.thrtl1
+    thrtl2 = dash.thrtl2
+    sdc = dash.sdc
+    mcan = dash.mcan
 
     # Setup: set brake and throttle to 0%
-    set_both(thrtl1, thrtl2, pedal_percent_to_volts(0))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_throttles(msg, 0, 0.1, "Setup")
+    mcan.clear(MSG_NAME)
+    with h.batched_writes():
+        set_both(thrtl1, thrtl2, 0)
+    pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+    check_throttles(pedals, 0, 0.1, "Setup")
 
     # Test with left as sens1
-    t_4_2_5_impl(True, thrtl1, thrtl2, sdc, mcan)
+    t_4_2_5_impl(h, True, thrtl1, thrtl2, sdc, mcan)
 
     # Setup: set brake and throttle to 0%
-    set_both(thrtl1, thrtl2, pedal_percent_to_volts(0))
-    time.sleep(SLEEP_TIME)
-    msg = mcan.get_last(MSG_NAME)
-    check_throttles(msg, 0, 0.1, "Setup")
+    mcan.clear(MSG_NAME)
+    with h.batched_writes():
+        set_both(thrtl1, thrtl2, 0)
+    pedals = PedalValues.from_msg(wait_for_msg(mcan, MSG_NAME))
+    check_throttles(pedals, 0, 0.1, "Setup")
 
     # Test with right as sens1
-    t_4_2_5_impl(False, thrtl2, thrtl1, sdc, mcan)
+    t_4_2_5_impl(h, False, thrtl2, thrtl1, sdc, mcan)
 
 # T.4.2.10 ----------------------------------------------------------------------------#
 def t_4_2_10_test_out_of_range(left_is_1: bool, sens1: hil2_comp.AO, sens2: hil2_comp.AO, sdc: hil2_comp.DI, mcan: hil2_comp.CAN):
@@ -276,7 +330,7 @@ def t_4_2_10_test_out_of_range(left_is_1: bool, sens1: hil2_comp.AO, sens2: hil2
 
 # Main --------------------------------------------------------------------------------#
 def main():
-    logging.basicConfig(level=logging.DEBUG)
+    logging.basicConfig(level=logging.INFO)
 
     with hil2.Hil2(
         "./tests/dash/config.json",
@@ -286,10 +340,11 @@ def main():
     ) as h:
         
         pow = h.do("HIL2", "RLY1")
+        dash = Dashboard.from_hil(h)
         
         mka.set_setup_fn(lambda: power_cycle(pow, 0.5))
-        mka.add_test(ev_4_7_2_test, h)
-        mka.add_test(t_4_2_5_test, h)
+        mka.add_test(ev_4_7_2_test, h, dash)
+        mka.add_test(t_4_2_5_test, h, dash)
         mka.run_tests()
 
 
@@ -1,10 +1,11 @@
-from typing import Optional
+from typing import Callable, NamedTuple, Optional
 
 import hil2.hil2 as hil2
 import hil2.component as hil2_comp
 import hil2.can_helper as can_helper
 import mk_assert.mk_assert as mka
 
+import functools
 import time
 import logging
 
@@ -13,7 +14,7 @@ PEDAL_LOW_V = 0.5 # volts read when pedal is not pressed (in normal orientation)
 PEDAL_HIGH_V = 4.5 # volts read when pedal is fully pressed (in normal orientation)
 PEDAL_PERCENT_V = (PEDAL_HIGH_V - PEDAL_LOW_V) / 100.0
 
-SLEEP_TIME = 0.01 # seconds, how long to wait before checking a CAN message
+CAN_TIMEOUT = 0.05 # seconds, how long to wait for a CAN message to arrive
 
 PEDAL_MSG = "raw_throttle_brake" # note: motor "off" => throttle = 0
 SHOCK_MSG = "shock_front"
@@ -62,8 +63,30 @@ def set_both(pedal1: hil2_comp.AO, pedal2: hil2_comp.AO, percent: float) -> None
     pedal1.set(pedal_percent_to_volts_1(percent))
     pedal2.set(pedal_percent_to_volts_2(percent))
 
-def check_msg(can_bus: hil2_comp.CAN, msg_name: str | int, test_prefix: str) -> Optional[can_helper.CanMessage]:
-    msg = can_bus.get_last(msg_name)
+def set_each(pedal1: hil2_comp.AO, pedal2: hil2_comp.AO, percent1: float, percent2: float) -> None:
+    """
+    Set a set of two pedals to (possibly) different percent values.
+
+    :param pedal1: First pedal AO component (in normal orientation)
+    :param pedal2: Second pedal AO component (in inverted orientation)
+    :param percent1: Percent value from 0 to 100 for the first pedal
+    :param percent2: Percent value from 0 to 100 for the second pedal
+    """
+    pedal1.set(pedal_percent_to_volts_1(percent1))
+    pedal2.set(pedal_percent_to_volts_2(percent2))
+
+def check_msg(can_bus: hil2_comp.CAN, msg_name: str | int, test_prefix: str, timeout: float = CAN_TIMEOUT) -> Optional[can_helper.CanMessage]:
+    """
+    Wait for a message to be received (since the last clear) and check that it was.
+    Returns as soon as the message arrives instead of sleeping for a fixed time.
+
+    :param can_bus: CAN bus component
+    :param msg_name: Name or id of the message to wait for
+    :param test_prefix: Prefix for the assertion message
+    :param timeout: Maximum time to wait in seconds
+    :return: The last received message, or None if none arrived in time
+    """
+    msg = can_bus.wait_for(msg_name, timeout)
     mka.assert_true(msg is not None, f"{test_prefix}: VCAN message received")
     return msg
 
@@ -86,10 +109,60 @@ def check_uart(uart: hil2_comp.DI, test_prefix: str):
         time.sleep(0.01)
     mka.assert_true(False, f"{test_prefix}: UART activity detected")
 
-def float_range(start, stop, step):
-    while start <= stop:
-        yield start
-        start += step
+def expect(brake: Optional[float] = None, throttle: Optional[tuple[float, float]] = None, sdc: Optional[hil2_comp.DI] = None, sdc_triggered: bool = False) -> Callable[[Optional[can_helper.CanMessage], str], None]:
+    """
+    Build the check for a step.
+
+    :param brake: Expected brake percent (both sides), or None to not check the brakes
+    :param throttle: Expected (left, right) throttle percents, or None to not check them
+    :param sdc: SDC DI component, or None to not check the SDC
+    :param sdc_triggered: Whether the SDC is expected to be triggered
+    :return: A function that checks a message, given the message and the step label
+    """
+    def check(msg: Optional[can_helper.CanMessage], test_prefix: str):
+        if brake is not None:
+            check_brakes(msg, brake, 0.1, test_prefix)
+        if throttle is not None:
+            check_throttles_diff(msg, throttle[0], throttle[1], 0.1, test_prefix)
+        if sdc is not None and sdc_triggered:
+            mka.assert_true(sdc.get(), f"{test_prefix}: SDC triggered")
+        elif sdc is not None:
+            mka.assert_false(sdc.get(), f"{test_prefix}: SDC not triggered")
+    return check
+
+class Step(NamedTuple):
+    """One test step: set the inputs, wait for the CAN message, then check it"""
+    label: str
+    setup: Optional[Callable[[], None]] # None to leave the inputs as they are
+    check: Callable[[Optional[can_helper.CanMessage], str], None]
+    delay: float = 0.0 # seconds to wait before the step (ex: for a fault to debounce)
+
+def run_steps(h: hil2.Hil2, can_bus: hil2_comp.CAN, msg_name: str | int, steps: list[Step]):
+    """
+    Run test steps back to back. Each step starts as soon as the previous step's
+    message has been received and checked, instead of after a fixed delay.
+    All of a step's outputs are sent to the HIL in one serial write.
+
+    :param h: HIL instance
+    :param can_bus: CAN bus component
+    :param msg_name: Name or id of the message each step checks
+    :param steps: The steps to run, in order
+    """
+    for step in steps:
+        if step.delay:
+            time.sleep(step.delay)
+        can_bus.clear()
+        if step.setup is not None:
+            with h.batched_writes():
+                step.setup()
+        msg = check_msg(can_bus, msg_name, step.label)
+        step.check(msg, step.label)
+
+def float_range(start, stop, step) -> tuple[float, ...]:
+    # Multiply instead of accumulating the step so rounding errors don't add up and
+    # drop (or add) the last value
+    count = int((stop - start) / step + 1e-9) + 1
+    return tuple(start + i * step for i in range(count))
 
 def shockpots_from_voltage(v_left: float, v_right: float) -> tuple[int, int]:
     POT_VOLT_MAX = 3.0
@@ -127,71 +200,33 @@ def ev_4_7_2_test(h: hil2.Hil2):
     thrtl2 = h.ao("Dashboard", "THRTL2_RAW")
     vcan = h.can("HIL2", "VCAN")
 
-    # Setup: set brake and throttle to 0%
-    vcan.clear()
-    set_both(brk1, brk2, 0)
-    set_both(thrtl1, thrtl2, 0)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Setup")
-    check_brakes(msg, 0, 0.1, "Setup")
-    check_throttles(msg, 0, 0.1, "Setup")
-    time.sleep(0.1)
-    
-    # Test 1: brake low, throttle low, check motor on
-    vcan.clear()
-    set_both(brk1, brk2, 5)
-    set_both(thrtl1, thrtl2, 5)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Brakes low, throttle low")
-    check_brakes(vcan, 5, 0.1, "Brakes low, throttle low")
-    check_throttles(vcan, 5, 0.1, "Brakes low, throttle low")
-    time.sleep(0.1)
-
-    # Test 2: brake high, throttle low, check motor on
-    vcan.clear()
-    set_both(brk1, brk2, 50)
-    set_both(thrtl1, thrtl2, 5)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Brakes high, throttle low")
-    check_brakes(msg, 50, 0.1, "Brakes high, throttle low")
-    check_throttles(msg, 5, 0.1, "Brakes high, throttle low")
-    time.sleep(0.1)
-
-    # Test 3: brake high, throttle high, check motor off
-    vcan.clear()
-    set_both(brk1, brk2, 50)
-    set_both(thrtl1, thrtl2, 50)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Brakes high, throttle high")
-    check_brakes(msg, 50, 0.1, "Brakes high, throttle high")
-    check_throttles(msg, 0, 0.1, "Brakes high, throttle high")
-    time.sleep(0.1)
-
-    # Test 4: brake low, throttle mid, check motor off (sweep down to 5% on throttle)
-    vcan.clear()
-    set_both(brk1, brk2, 4)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Brakes low, throttle mid")
-    check_brakes(msg, 4, 0.1, "Brakes low, throttle mid")
-
+    def set_pedals(brake: float, throttle: float) -> None:
+        set_both(brk1, brk2, brake)
+        set_both(thrtl1, thrtl2, throttle)
+
+    steps = [
+        # Setup: set brake and throttle to 0%
+        Step("Setup", functools.partial(set_pedals, 0, 0), expect(brake=0, throttle=(0, 0))),
+        # Test 1: brake low, throttle low, check motor on
+        Step("Brakes low, throttle low", functools.partial(set_pedals, 5, 5), expect(brake=5, throttle=(5, 5))),
+        # Test 2: brake high, throttle low, check motor on
+        Step("Brakes high, throttle low", functools.partial(set_pedals, 50, 5), expect(brake=50, throttle=(5, 5))),
+        # Test 3: brake high, throttle high, check motor off
+        Step("Brakes high, throttle high", functools.partial(set_pedals, 50, 50), expect(brake=50, throttle=(0, 0))),
+        # Test 4: brake low, throttle mid, check motor off (sweep down to 5% on throttle)
+        Step("Brakes low, throttle mid", functools.partial(set_both, brk1, brk2, 4), expect(brake=4)),
+    ]
     for p in range(50, 4, -1):
-        vcan.clear()
-        set_both(thrtl1, thrtl2, p)
-        time.sleep(SLEEP_TIME)
-        msg = check_msg(vcan, PEDAL_MSG, f"Brakes low, throttle {p}")
         expected_throttle = 0 if p > 5 else p
-        check_throttles(msg, expected_throttle, 0.1, f"Brakes low, throttle {p} (expected {expected_throttle}%)")
-    
-    time.sleep(0.1)
-
+        steps.append(Step(
+            f"Brakes low, throttle {p} (expected {expected_throttle}%)",
+            functools.partial(set_both, thrtl1, thrtl2, p),
+            expect(throttle=(expected_throttle, expected_throttle)),
+        ))
     # Test 5: brake low, throttle mid, check motor back on
-    vcan.clear()
-    set_both(brk1, brk2, 5)
-    set_both(thrtl1, thrtl2, 25)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Brakes low, throttle mid")
-    check_brakes(msg, 5, 0.1, "Brakes low, throttle mid")
-    check_throttles(msg, 25, 0.1, "Brakes low, throttle mid")
+    steps.append(Step("Brakes low, throttle mid", functools.partial(set_pedals, 5, 25), expect(brake=5, throttle=(25, 25))))
+
+    run_steps(h, vcan, PEDAL_MSG, steps)
 
 
 # T.4.2.5 -----------------------------------------------------------------------------#
@@ -211,147 +246,35 @@ def t_4_2_5_test(h: hil2.Hil2):
     vcan = h.can("HIL2", "VCAN")
     sdc = h.di("Dashboard", "SDC")
 
-    # Set 1: sens1 = left, sens2 = right ----------------------------------------------#
-
-    # Similar, check motor on, sdc not triggered
-    vcan.clear()
-    set_both(thrtl1, thrtl2, 25)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 1 - Similar")
-    check_throttles(msg, 25, 0.1, "Set 1 - Similar")
-    mka.assert_false(sdc.get(), "Set 1 - Similar: SDC not triggered")
-    time.sleep(0.1)
-
-    # Slightly different, check motor on, sdc not triggered
-    vcan.clear()
-    thrtl1.set(pedal_percent_to_volts_1(20))
-    thrtl2.set(pedal_percent_to_volts_2(25))
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 1 - Slightly different")
-    check_throttles_diff(msg, 20, 25, 0.1, "Set 1 - Slightly different")
-    mka.assert_false(sdc.get(), "Set 1 - Slightly different: SDC not triggered")
-    time.sleep(0.1)
-
-    # 10% different, check motor on, sdc not triggered
-    vcan.clear()
-    thrtl1.set(pedal_percent_to_volts_1(20))
-    thrtl2.set(pedal_percent_to_volts_2(30))
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 1 - 10% different")
-    check_throttles_diff(msg, 20, 30, 0.1, "Set 1 - 10% different")
-    mka.assert_false(sdc.get(), "Set 1 - 10% different: SDC not triggered")
-    time.sleep(0.03)
-
-    # Slightly different, check motor on, sdc not triggered
-    vcan.clear()
-    thrtl1.set(pedal_percent_to_volts_1(25))
-    thrtl2.set(pedal_percent_to_volts_2(30))
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 1 - Slightly different")
-    check_throttles_diff(msg, 25, 30, 0.1, "Set 1 - Slightly different")
-    mka.assert_false(sdc.get(), "Set 1 - Slightly different: SDC not triggered")
-    time.sleep(0.1)
-
-    # 10% different, check motor on, sdc not triggered
-    vcan.clear()
-    thrtl1.set(pedal_percent_to_volts_1(20))
-    thrtl2.set(pedal_percent_to_volts_2(30))
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 1 - 10% different")
-    check_throttles_diff(msg, 20, 30, 0.1, "Set 1 - 10% different")
-    mka.assert_false(sdc.get(), "Set 1 - 10% different: SDC not triggered")
-    time.sleep(0.03)
-
-    # Still 10% different (~100 msec later), check motor off, sdc not triggered
-    vcan.clear()
-    time.sleep(0.07)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 1 - Still 10% different (~100 msec later)")
-    check_throttles(msg, 0, 0.1, "Set 1 - Still 10% different (~100 msec later)")
-    mka.assert_false(sdc.get(), "Set 1 - Still 10% different (~100 msec later): SDC not triggered")
-    time.sleep(0.1)
-
-    # Power cycle and confirm everything resets
-    power_cycle(h)
-
-    # Similar, check motor on, sdc not triggered
-    vcan.clear()
-    set_both(thrtl1, thrtl2, 20)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 1 - Similar")
-    check_throttles(msg, 20, 0.1, "Set 1 - Similar")
-    mka.assert_false(sdc.get(), "Set 1 - Similar: SDC not triggered")
-    time.sleep(0.1)
-
-    # Set 2: sens1 = right, sens2 = left ----------------------------------------------#
-    
-    # Similar, check motor on, sdc not triggered
-    vcan.clear()
-    set_both(thrtl1, thrtl2, 25)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 2 - Similar")
-    check_throttles(msg, 25, 0.1, "Set 2 - Similar")
-    mka.assert_false(sdc.get(), "Set 2 - Similar: SDC not triggered")
-    time.sleep(0.1)
-
-    # Slightly different, check motor on, sdc not triggered
-    vcan.clear()
-    thrtl1.set(pedal_percent_to_volts_1(25))
-    thrtl2.set(pedal_percent_to_volts_2(20))
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 2 - Slightly different")
-    check_throttles_diff(msg, 25, 20, 0.1, "Set 2 - Slightly different")
-    mka.assert_false(sdc.get(), "Set 2 - Slightly different: SDC not triggered")
-    time.sleep(0.1)
-
-    # 10% different, check motor on, sdc not triggered
-    vcan.clear()
-    thrtl1.set(pedal_percent_to_volts_1(30))
-    thrtl2.set(pedal_percent_to_volts_2(20))
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 2 - 10% different")
-    check_throttles_diff(msg, 30, 20, 0.1, "Set 2 - 10% different")
-    mka.assert_false(sdc.get(), "Set 2 - 10% different: SDC not triggered")
-    time.sleep(0.03)
-
-    # Slightly different, check motor on, sdc not triggered
-    vcan.clear()
-    thrtl1.set(pedal_percent_to_volts_1(30))
-    thrtl2.set(pedal_percent_to_volts_2(25))
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 2 - Slightly different")
-    check_throttles_diff(msg, 30, 25, 0.1, "Set 2 - Slightly different")
-    mka.assert_false(sdc.get(), "Set 2 - Slightly different: SDC not triggered")
-    time.sleep(0.1)
-
-    # 10% different, check motor on, sdc not triggered
-    vcan.clear()
-    thrtl1.set(pedal_percent_to_volts_1(30))
-    thrtl2.set(pedal_percent_to_volts_2(20))
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 2 - 10% different")
-    check_throttles_diff(msg, 30, 20, 0.1, "Set 2 - 10% different")
-    mka.assert_false(sdc.get(), "Set 2 - 10% different: SDC not triggered")
-    time.sleep(0.03)
-
-    # Still 10% different (~100 msec later), check motor off, sdc not triggered
-    vcan.clear()
-    time.sleep(0.07)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 2 - Still 10% different (~100 msec later)")
-    check_throttles(msg, 0, 0.1, "Set 2 - Still 10% different (~100 msec later)")
-    mka.assert_false(sdc.get(), "Set 2 - Still 10% different (~100 msec later): SDC not triggered")
-    time.sleep(0.1)
-
-    # Power cycle and confirm everything resets
-    power_cycle(h)
-
-    # Similar, check motor on, sdc not triggered
-    vcan.clear()
-    set_both(thrtl1, thrtl2, 20)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Set 2 - Similar")
-    check_throttles(msg, 20, 0.1, "Set 2 - Similar")
-    mka.assert_false(sdc.get(), "Set 2 - Similar: SDC not triggered")
-    time.sleep(0.1)
+    # Set 1: sens1 = left, sens2 = right. Set 2: sens1 = right, sens2 = left
+    # (set name, slightly different, 10% different, slightly different again) percents
+    sets = (
+        ("Set 1", (20, 25), (20, 30), (25, 30)),
+        ("Set 2", (25, 20), (30, 20), (30, 25)),
+    )
+    for set_name, (p_a, p_b), (p_a_far, p_b_far), (p_a_slight, p_b_slight) in sets:
+        run_steps(h, vcan, PEDAL_MSG, [
+            # Similar, check motor on, sdc not triggered
+            Step(f"{set_name} - Similar", functools.partial(set_both, thrtl1, thrtl2, 25), expect(throttle=(25, 25), sdc=sdc)),
+            # Slightly different, check motor on, sdc not triggered
+            Step(f"{set_name} - Slightly different", functools.partial(set_each, thrtl1, thrtl2, p_a, p_b), expect(throttle=(p_a, p_b), sdc=sdc)),
+            # 10% different, check motor on, sdc not triggered
+            Step(f"{set_name} - 10% different", functools.partial(set_each, thrtl1, thrtl2, p_a_far, p_b_far), expect(throttle=(p_a_far, p_b_far), sdc=sdc)),
+            # Slightly different, check motor on, sdc not triggered
+            Step(f"{set_name} - Slightly different", functools.partial(set_each, thrtl1, thrtl2, p_a_slight, p_b_slight), expect(throttle=(p_a_slight, p_b_slight), sdc=sdc), delay=0.03),
+            # 10% different, check motor on, sdc not triggered
+            Step(f"{set_name} - 10% different", functools.partial(set_each, thrtl1, thrtl2, p_a_far, p_b_far), expect(throttle=(p_a_far, p_b_far), sdc=sdc)),
+            # Still 10% different (~100 msec later), check motor off, sdc not triggered
+            Step(f"{set_name} - Still 10% different (~100 msec later)", None, expect(throttle=(0, 0), sdc=sdc), delay=0.1),
+        ])
+
+        # Power cycle and confirm everything resets
+        power_cycle(h)
+
+        # Similar, check motor on, sdc not triggered
+        run_steps(h, vcan, PEDAL_MSG, [
+            Step(f"{set_name} - Similar", functools.partial(set_both, thrtl1, thrtl2, 20), expect(throttle=(20, 20), sdc=sdc)),
+        ])
 
 # T.4.2.10 ----------------------------------------------------------------------------#
 def t_4_2_10_test(h: hil2.Hil2):
@@ -367,85 +290,62 @@ def t_4_2_10_test(h: hil2.Hil2):
 
     # Set 1: out of range high --------------------------------------------------------#
 
-    # Both ok, check motor on, sdc not triggered
-    vcan.clear()
-    set_both(thrtl1, thrtl2, 25)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Both ok")
-    check_throttles(msg, 25, 0.1, "Both ok")
-    mka.assert_false(sdc.get(), "Both ok: SDC not triggered")
-    time.sleep(0.1)
+    def out_of_range_high() -> None:
+        thrtl1.set(5.5) # volts
+        thrtl2.set(5.5) # volts
 
-    # Both out of range high, check motor off, sdc triggered
-    vcan.clear()
-    thrtl1.set(5.5) # volts
-    thrtl2.set(5.5) # volts
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Both out of range high")
-    check_throttles(msg, 0, 0.1, "Both out of range high")
-    mka.assert_true(sdc.get(), "Both out of range high: SDC triggered")
-    time.sleep(0.1)
+    run_steps(h, vcan, PEDAL_MSG, [
+        # Both ok, check motor on, sdc not triggered
+        Step("Both ok", functools.partial(set_both, thrtl1, thrtl2, 25), expect(throttle=(25, 25), sdc=sdc)),
+        # Both out of range high, check motor off, sdc triggered
+        Step("Both out of range high", out_of_range_high, expect(throttle=(0, 0), sdc=sdc, sdc_triggered=True)),
+    ])
 
     # Power cycle and confirm everything resets
     power_cycle(h)
 
     # Both ok, check motor on, sdc not triggered
-    vcan.clear()
-    set_both(thrtl1, thrtl2, 20)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Both ok")
-    check_throttles(msg, 20, 0.1, "Both ok")
-    mka.assert_false(sdc.get(), "Both ok: SDC not triggered")
-    time.sleep(0.1)
-
+    run_steps(h, vcan, PEDAL_MSG, [
+        Step("Both ok", functools.partial(set_both, thrtl1, thrtl2, 20), expect(throttle=(20, 20), sdc=sdc)),
+    ])
 
     # Set 2: throttle 1 disconnects ---------------------------------------------------#
 
+    def sens1_disconnected() -> None:
+        thrtl2.set(pedal_percent_to_volts_2(25))
+        thrtl1.hiZ()
+
     # Sens1 disconnected, check motor off, sdc triggered
-    vcan.clear()
-    thrtl2.set(pedal_percent_to_volts_2(25))
-    thrtl1.hiZ()
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Sens1 disconnected")
-    check_throttles(msg, 0, 0.1, "Sens1 disconnected")
-    mka.assert_true(sdc.get(), "Sens1 disconnected: SDC triggered")
-    time.sleep(0.1)
+    run_steps(h, vcan, PEDAL_MSG, [
+        Step("Sens1 disconnected", sens1_disconnected, expect(throttle=(0, 0), sdc=sdc, sdc_triggered=True)),
+    ])
 
     # Power cycle and confirm everything resets
     power_cycle(h)
 
     # Sens1 and sens2 ok, check motor on, sdc not triggered
-    vcan.clear()
-    set_both(thrtl1, thrtl2, 20)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Sens1 and sens2 ok")
-    check_throttles(msg, 20, 0.1, "Sens1 and sens2 ok")
-    mka.assert_false(sdc.get(), "Sens1 and sens2 ok: SDC not triggered")
-    time.sleep(0.1)
+    run_steps(h, vcan, PEDAL_MSG, [
+        Step("Sens1 and sens2 ok", functools.partial(set_both, thrtl1, thrtl2, 20), expect(throttle=(20, 20), sdc=sdc)),
+    ])
 
     # Set 3: throttle 2 disconnects ---------------------------------------------------#
 
+    def sens2_disconnected() -> None:
+        thrtl1.set(pedal_percent_to_volts_1(25))
+        thrtl2.hiZ()
+
     # Sens2 disconnected, check motor off, sdc triggered
-    vcan.clear()
-    thrtl1.set(pedal_percent_to_volts_1(25))
-    thrtl2.hiZ()
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Sens2 disconnected")
-    check_throttles(msg, 0, 0.1, "Sens2 disconnected")
-    mka.assert_true(sdc.get(), "Sens2 disconnected: SDC triggered")
-    time.sleep(0.1)
+    run_steps(h, vcan, PEDAL_MSG, [
+        Step("Sens2 disconnected", sens2_disconnected, expect(throttle=(0, 0), sdc=sdc, sdc_triggered=True)),
+    ])
 
     # Power cycle and confirm everything resets
     power_cycle(h)
 
     # Sens1 and sens2 ok, check motor on, sdc not triggered
-    vcan.clear()
-    set_both(thrtl1, thrtl2, 20)
-    time.sleep(SLEEP_TIME)
-    msg = check_msg(vcan, PEDAL_MSG, "Sens1 and sens2 ok")
-    check_throttles(msg, 20, 0.1, "Sens1 and sens2 ok")
-    mka.assert_false(sdc.get(), "Sens1 and sens2 ok: SDC not triggered")
-    time.sleep(0.1)
+    run_steps(h, vcan, PEDAL_MSG, [
+        Step("Sens1 and sens2 ok", functools.partial(set_both, thrtl1, thrtl2, 20), expect(throttle=(20, 20), sdc=sdc)),
+    ])
 
 
 # Buttons test ------------------------------------------------------------------------#
@@ -462,10 +362,11 @@ def buttons_test(h: hil2.Hil2):
     uart = h.di("Dashboard", "USART_LCD_TX")
 
     # Setup: set all buttons to not pressed
-    up.set(False)
-    down.set(False)
-    select.set(False)
-    start.set(False)
+    with h.batched_writes():
+        up.set(False)
+        down.set(False)
+        select.set(False)
+        start.set(False)
 
     # Test 1: press UP, check UART activity
     up.set(True)
@@ -503,18 +404,25 @@ def shockpot_test(h: hil2.Hil2):
     right = h.ao("Dashboard", "RightPot")
     vcan = h.can("HIL2", "VCAN")
 
-    for lv in float_range(0, 3, 0.2):
-        left.set(lv)
-        for rv in float_range(0, 3, 0.2):
-            vcan.clear()
-            right.set(rv)
-            time.sleep(SLEEP_TIME)
-
-            msg = check_msg(vcan, SHOCK_MSG, f"Left {lv:.1f}V, Right {rv:.1f}V")
-            exp_l, exp_r = shockpots_from_voltage(lv, rv)
-            mka.assert_true(msg is not None, f"Left {lv:.1f}V, Right {rv:.1f}V: CAN message received")
-            mka.assert_true(msg is not None and msg["left_shock"] == exp_l, f"Left {lv:.1f}V, Right {rv:.1f}V: left shock {exp_l}")
-            mka.assert_true(msg is not None and msg["right_shock"] == exp_r, f"Left {lv:.1f}V, Right {rv:.1f}V: right shock {exp_r}")
+    volts = float_range(0, 3, 0.2)
+    # The left shock only depends on the left voltage (and right on right), so each
+    # expected value only has to be computed once per voltage, not once per pair
+    expected = [shockpots_from_voltage(v, v) for v in volts]
+    clear_msgs = vcan.clear
+    set_left = left.set
+    set_right = right.set
+    for lv, (exp_l, _) in zip(volts, expected):
+        set_left(lv)
+        for rv, (_, exp_r) in zip(volts, expected):
+            prefix = f"Left {lv:.1f}V, Right {rv:.1f}V"
+            clear_msgs()
+            set_right(rv)
+
+            msg = check_msg(vcan, SHOCK_MSG, prefix)
+            data = msg.data if msg is not None else {}
+            mka.assert_true(msg is not None, f"{prefix}: CAN message received")
+            mka.assert_true(data.get("left_shock") == exp_l, f"{prefix}: left shock {exp_l}")
+            mka.assert_true(data.get("right_shock") == exp_r, f"{prefix}: right shock {exp_r}")
 
 
 